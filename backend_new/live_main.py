@@ -13,13 +13,13 @@ from typing import Dict, List, Optional, Any
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 import socketio
 
 from pybit.unified_trading import HTTP
-import openai
 
 # Import nieuwe services
 from services.strategy_engine import strategy_engine, Strategy, StrategyStatus, TradingSignal
@@ -162,10 +162,26 @@ def save_openai_connections(connections):
 connections_store = load_connections()
 openai_connections_store = load_openai_connections()
 
+# Reused pybit sessions, keyed by credentials so each account keeps its own pool
+_sessions: Dict[tuple, HTTP] = {}
+
+def _get_session(api_key: str, secret_key: str, testnet: bool = False) -> HTTP:
+    """Get a cached pybit HTTP session instead of rebuilding one per call"""
+    key = (api_key, secret_key, testnet)
+    session = _sessions.get(key)
+    if session is None:
+        session = _sessions[key] = HTTP(testnet=testnet, api_key=api_key, api_secret=secret_key)
+    return session
+
+def _drop_sessions(api_key: str):
+    """Forget cached sessions for an API key"""
+    for key in [k for k in _sessions if k[0] == api_key]:
+        del _sessions[key]
+
 def get_live_account_data(api_key: str, secret_key: str, connection_name: str = ""):
     """Get real account data from ByBit API"""
     try:
-        session = HTTP(testnet=False, api_key=api_key, api_secret=secret_key)
+        session = _get_session(api_key, secret_key)
         
         # Log connection name for debugging
         logger.info(f"Getting account data for: {connection_name}")
@@ -352,6 +368,7 @@ def get_live_account_data(api_key: str, secret_key: str, connection_name: str =
 def get_openai_account_data(api_key: str, organization: str = ""):
     """Get real OpenAI account data including usage and billing"""
     try:
+        import openai  # lazy: openai SDK laadt traag bij cold start
         client = openai.OpenAI(
             api_key=api_key,
             organization=organization if organization else None
@@ -410,7 +427,8 @@ def get_openai_account_data(api_key: str, organization: str = ""):
 app = FastAPI(
     title="CTB Trading Bot - Live ByBit Backend",
     description="Live ByBit API integratie - alleen echte data",
-    version="2.0.0-live"
+    version="2.0.0-live",
+    default_response_class=ORJSONResponse
 )
 
 # Initialize Socket.IO
@@ -675,14 +693,10 @@ async def debug_wallet(connection_id: str):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        session = HTTP(
-            testnet=False,
-            api_key=conn_data.get("apiKey", ""),
-            api_secret=conn_data.get("secretKey", "")
-        )
+        session = _get_session(conn_data.get("apiKey", ""), conn_data.get("secretKey", ""))
         
         # Get raw wallet balance
-        balance_result = session.get_wallet_balance(accountType="UNIFIED")
+        balance_result = await run_in_threadpool(session.get_wallet_balance, accountType="UNIFIED")
         
         return {
             "success": True,
@@ -701,13 +715,10 @@ async def test_bybit_connection(credentials: ByBitCredentials):
     try:
         logger.info("Testing live ByBit connection...")
         
-        session = HTTP(
-            testnet=False,
-            api_key=credentials.apiKey,
-            api_secret=credentials.secretKey,
-        )
+        session = _get_session(credentials.apiKey, credentials.secretKey)
         
-        result = session.get_wallet_balance(accountType="UNIFIED")
+        # pybit is blocking, keep it off the event loop
+        result = await run_in_threadpool(session.get_wallet_balance, accountType="UNIFIED")
         
         if result["retCode"] == 0:
             return {
@@ -729,12 +740,8 @@ async def add_connection(connection: ConnectionCreate, current_user: dict = Depe
         logger.info(f"Adding live ByBit connection: {connection.name}")
         
         # Test connection first
-        session = HTTP(
-            testnet=False,
-            api_key=connection.apiKey,
-            api_secret=connection.secretKey,
-        )
-        result = session.get_wallet_balance(accountType="UNIFIED")
+        session = _get_session(connection.apiKey, connection.secretKey)
+        result = await run_in_threadpool(session.get_wallet_balance, accountType="UNIFIED")
         if result["retCode"] != 0:
             raise Exception(f"ByBit API Error: {result['retMsg']}")
         
@@ -750,7 +757,7 @@ async def add_connection(connection: ConnectionCreate, current_user: dict = Depe
         save_connections(connections_store)
         
         # Get live account data
-        live_data = get_live_account_data(connection.apiKey, connection.secretKey, connection.name)
+        live_data = await run_in_threadpool(get_live_account_data, connection.apiKey, connection.secretKey, connection.name)
         
         return {
             "success": True,
@@ -780,7 +787,8 @@ async def get_connections():
                     conn_data.get("secretKey", "")
                 )
                 
-                live_data = get_live_account_data(
+                live_data = await run_in_threadpool(
+                    get_live_account_data,
                     conn_data.get("apiKey", ""), 
                     conn_data.get("secretKey", ""),
                     conn_data.get("name", "")
@@ -825,7 +833,8 @@ async def get_connection(connection_id: str):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        live_data = get_live_account_data(
+        live_data = await run_in_threadpool(
+            get_live_account_data,
             conn_data.get("apiKey", ""), 
             conn_data.get("secretKey", ""),
             conn_data.get("name", "")
@@ -857,7 +866,8 @@ async def remove_connection(connection_id: str, current_user: dict = Depends(req
         if connection_id not in connections_store:
             raise HTTPException(status_code=404, detail="Connection not found")
         
-        del connections_store[connection_id]
+        removed = connections_store.pop(connection_id)
+        _drop_sessions(removed.get("apiKey", ""))
         save_connections(connections_store)
         
         return {"success": True, "message": "Connection removed successfully"}
@@ -896,9 +906,16 @@ async def get_market_data(symbols: Optional[str] = None, current_user: dict = De
         
         market_data = []
         
-        for symbol in symbol_list:
+        # Alle symbolen tegelijk ophalen in de threadpool, pybit blokkeert
+        ticker_results = await asyncio.gather(
+            *(run_in_threadpool(connection.get_tickers, category="linear", symbol=symbol) for symbol in symbol_list),
+            return_exceptions=True
+        )
+        
+        for symbol, ticker_result in zip(symbol_list, ticker_results):
             try:
-                ticker_result = connection.get_tickers(category="linear", symbol=symbol)
+                if isinstance(ticker_result, Exception):
+                    raise ticker_result
                 if ticker_result["retCode"] == 0 and ticker_result["result"]["list"]:
                     ticker = ticker_result["result"]["list"][0]
                     
@@ -946,7 +963,8 @@ async def get_portfolio_summary(current_user: dict = Depends(require_viewer)):
         
         for conn_id, conn_data in connections_store.items():
             try:
-                live_data = get_live_account_data(
+                live_data = await run_in_threadpool(
+                    get_live_account_data,
                     conn_data.get("apiKey", ""), 
                     conn_data.get("secretKey", ""),
                     conn_data.get("name", "")
@@ -992,6 +1010,7 @@ async def test_openai_connection(credentials: OpenAICredentials):
     try:
         logger.info("Testing live OpenAI connection...")
         
+        import openai
         client = openai.OpenAI(
             api_key=credentials.apiKey,
             organization=credentials.organization if credentials.organization else None
@@ -1018,6 +1037,7 @@ async def add_openai_connection(connection: OpenAIConnectionCreate):
         logger.info(f"Adding live OpenAI connection: {connection.connectionId}")
         
         # Test connection first
+        import openai
         client = openai.OpenAI(
             api_key=connection.apiKey,
             organization=connection.organization if connection.organization else None
@@ -1155,6 +1175,7 @@ async def get_strategy_advice(request: StrategyAdviceRequest):
         conn_data = openai_connections_store[connection_id]
         
         # Initialize OpenAI client
+        import openai
         client = openai.OpenAI(
             api_key=conn_data.get("apiKey", ""),
             organization=conn_data.get("organization", "") if conn_data.get("organization") else None
@@ -1268,6 +1289,7 @@ async def optimize_indicators(request: IndicatorOptimizationRequest):
         conn_data = openai_connections_store[connection_id]
         
         # Initialize OpenAI client with GPT-4
+        import openai
         client = openai.OpenAI(
             api_key=conn_data.get("apiKey", ""),
             organization=conn_data.get("organization", "") if conn_data.get("organization") else None
@@ -1451,6 +1473,7 @@ async def optimize_trade_parameters(request: TradeParametersRequest):
         conn_data = openai_connections_store[connection_id]
         
         # Initialize OpenAI client with GPT-4
+        import openai
         client = openai.OpenAI(
             api_key=conn_data.get("apiKey", ""),
             organization=conn_data.get("organization", "") if conn_data.get("organization") else None
@@ -1614,6 +1637,7 @@ async def generate_analysis(request: dict):
         conn_data = openai_connections_store[connection_id]
         
         # Initialize OpenAI client
+        import openai
         client = openai.OpenAI(
             api_key=conn_data.get("apiKey", ""),
             organization=conn_data.get("organization", "") if conn_data.get("organization") else None
@@ -1721,6 +1745,7 @@ async def test_completion(request: dict):
         conn_data = openai_connections_store[connection_id]
         
         # Initialize OpenAI client
+        import openai
         client = openai.OpenAI(
             api_key=conn_data.get("apiKey", ""),
             organization=conn_data.get("organization", "") if conn_data.get("organization") else None
@@ -1831,20 +1856,29 @@ async def stop_mass_optimization():
         logger.error(f"Failed to stop mass optimization: {e}")
         raise HTTPException(status_code=500, detail=f"Mass optimization stop error: {str(e)}")
 
+# Max gelijktijdige OpenAI optimalisaties per coin tijdens mass optimization
+MASS_OPTIMIZATION_CONCURRENCY = 3
+
 async def run_mass_optimization(status_dict):
     """Background task to run mass optimization"""
     try:
-        from services.ai_trading_optimizer import AITradingOptimizer
-        from services.mass_symbol_manager import MassSymbolManager
+        from services.ai_trading_optimizer import ai_optimizer as optimizer
+        from services.mass_symbol_manager import mass_symbol_manager as symbol_manager
         
-        # Initialize services
-        optimizer = AITradingOptimizer()
-        symbol_manager = MassSymbolManager()
+        # Gedeelde services hergebruiken; OpenAI key opnieuw proberen als die later is toegevoegd
+        optimizer.ensure_initialized()
         
         # Get all trading symbols
         symbols = await symbol_manager.get_all_symbols()
         status_dict["total_coins"] = len(symbols)
         
+        # Bound the number of OpenAI requests in flight
+        semaphore = asyncio.Semaphore(MASS_OPTIMIZATION_CONCURRENCY)
+        
+        async def optimize_limited(symbol, strategy_config):
+            async with semaphore:
+                return await optimizer.optimize_strategy_for_symbol(symbol, strategy_config, status_dict["criteria"])
+        
         logger.info(f"🎯 Starting mass optimization for {len(symbols)} symbols")
         
         for i, symbol in enumerate(symbols):
@@ -1855,18 +1889,13 @@ async def run_mass_optimization(status_dict):
             status_dict["processed_coins"] = i + 1
             
             try:
-                # Get market data for symbol
-                market_data = await symbol_manager.get_market_data(symbol)
+                # Run AI optimization for all strategies concurrently, the optimizer fetches its own market data
+                results = await asyncio.gather(*[
+                    optimize_limited(symbol, strategy_config)
+                    for strategy_config in status_dict["strategies"]
+                ])
                 
-                # Run AI optimization for each strategy
-                for strategy_config in status_dict["strategies"]:
-                    # Optimize strategy parameters using AI
-                    optimized_params = await optimizer.optimize_strategy_for_symbol(
-                        symbol, 
-                        strategy_config, 
-                        status_dict["criteria"]
-                    )
-                    
+                for optimized_params in results:
                     if optimized_params and optimized_params.get("meets_criteria", False):
                         # Deploy strategy with optimized parameters
                         deployed = await deploy_optimized_strategy(symbol, optimized_params)
@@ -1954,15 +1983,11 @@ async def execute_strategy_signal(request: dict):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        session = HTTP(
-            testnet=False,
-            api_key=conn_data["apiKey"],
-            api_secret=conn_data["secretKey"]
-        )
+        session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
         
         # Set position mode and margin settings
         try:
-            position_mode_result = session.set_position_mode(category="linear", mode=3)
+            position_mode_result = await run_in_threadpool(session.set_position_mode, category="linear", mode=3)
             logger.info(f"Position mode result: {position_mode_result}")
         except Exception as e:
             logger.warning(f"Failed to set position mode: {e}")
@@ -1986,7 +2011,7 @@ async def execute_strategy_signal(request: dict):
         logger.info(f"📝 Strategy order data: {order_data}")
         
         # Execute the order
-        result = session.place_order(**order_data)
+        result = await run_in_threadpool(session.place_order, **order_data)
         logger.info(f"📊 Strategy order result: {result}")
         
         if result["retCode"] == 0:
@@ -2037,14 +2062,11 @@ async def get_strategy_status(strategy_id: str, current_user: dict = Depends(req
         for conn_id, conn_data in connections_store.items():
             if conn_id == strategy.get('connection_id'):
                 try:
-                    session = HTTP(
-                        testnet=False,
-                        api_key=conn_data["apiKey"],
-                        api_secret=conn_data["secretKey"]
-                    )
+                    session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
                     
                     # Get orders for strategy symbol
-                    result = session.get_open_orders(
+                    result = await run_in_threadpool(
+                        session.get_open_orders,
                         category="linear", 
                         symbol=strategy.get('symbol')
                     )
@@ -2139,36 +2161,24 @@ async def stop_strategy(request: dict, current_user: dict = Depends(require_trad
                 logger.warning(f"Connection {connection_id} not found for strategy {strategy_id}")
             else:
                 conn_data = connections_store[connection_id]
-                session = HTTP(
-                    testnet=False,
-                    api_key=conn_data["apiKey"],
-                    api_secret=conn_data["secretKey"]
-                )
+                session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
                 
-                # First: Cancel ALL open orders for this strategy's symbol
+                # First: Cancel ALL open orders for this strategy's symbol in one request
                 try:
-                    orders_result = session.get_open_orders(category="linear", symbol=strategy_symbol)
-                    if orders_result["retCode"] == 0:
-                        for order in orders_result["result"]["list"]:
-                            order_id = order.get("orderId")
-                            if order_id:
-                                try:
-                                    cancel_result = session.cancel_order(
-                                        category="linear",
-                                        symbol=strategy_symbol,
-                                        orderId=order_id
-                                    )
-                                    if cancel_result["retCode"] == 0:
-                                        cancelled_orders.append(order_id)
-                                        logger.info(f"✅ Cancelled order {order_id} for strategy {strategy_id}")
-                                except Exception as e:
-                                    logger.error(f"Failed to cancel order {order_id}: {e}")
+                    cancel_result = await run_in_threadpool(session.cancel_all_orders, category="linear", symbol=strategy_symbol)
+                    if cancel_result["retCode"] == 0:
+                        cancelled_orders.extend(
+                            order["orderId"] for order in cancel_result["result"]["list"] if order.get("orderId")
+                        )
+                        logger.info(f"✅ Cancelled {len(cancelled_orders)} orders for strategy {strategy_id}")
+                    else:
+                        logger.error(f"Failed to cancel orders for symbol {strategy_symbol}: {cancel_result}")
                 except Exception as e:
-                    logger.error(f"Failed to get orders for symbol {strategy_symbol}: {e}")
+                    logger.error(f"Failed to cancel orders for symbol {strategy_symbol}: {e}")
                 
                 # Second: Close ONLY positions that belong to this strategy's symbol
                 try:
-                    positions_result = session.get_positions(category="linear", symbol=strategy_symbol)
+                    positions_result = await run_in_threadpool(session.get_positions, category="linear", symbol=strategy_symbol)
                     
                     if positions_result["retCode"] == 0:
                         for pos in positions_result["result"]["list"]:
@@ -2183,7 +2193,8 @@ async def stop_strategy(request: dict, current_user: dict = Depends(require_trad
                                     close_side = "Sell" if side == "Buy" else "Buy"
                                     
                                     try:
-                                        close_result = session.place_order(
+                                        close_result = await run_in_threadpool(
+                                            session.place_order,
                                             category="linear",
                                             symbol=symbol,
                                             side=close_side,
@@ -2245,14 +2256,10 @@ async def get_open_orders(connection_id: str):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        session = HTTP(
-            testnet=False,
-            api_key=conn_data["apiKey"],
-            api_secret=conn_data["secretKey"]
-        )
+        session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
         
         # Get open orders
-        result = session.get_open_orders(category="linear", settleCoin="USDT")
+        result = await run_in_threadpool(session.get_open_orders, category="linear", settleCoin="USDT")
         
         if result["retCode"] == 0:
             orders = []
@@ -2305,14 +2312,11 @@ async def cancel_order(request: dict):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        session = HTTP(
-            testnet=False,
-            api_key=conn_data["apiKey"],
-            api_secret=conn_data["secretKey"]
-        )
+        session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
         
         # Cancel the order
-        result = session.cancel_order(
+        result = await run_in_threadpool(
+            session.cancel_order,
             category="linear",
             symbol=symbol,
             orderId=order_id
@@ -2348,11 +2352,7 @@ async def modify_order(request: dict):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        session = HTTP(
-            testnet=False,
-            api_key=conn_data["apiKey"],
-            api_secret=conn_data["secretKey"]
-        )
+        session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
         
         # Build modification parameters
         modify_params = {
@@ -2373,7 +2373,7 @@ async def modify_order(request: dict):
             modify_params["stopLoss"] = str(request["stopLoss"])
         
         # Modify the order
-        result = session.amend_order(**modify_params)
+        result = await run_in_threadpool(session.amend_order, **modify_params)
         
         if result["retCode"] == 0:
             return {
@@ -2405,14 +2405,10 @@ async def close_position(request: dict):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        session = HTTP(
-            testnet=False,
-            api_key=conn_data["apiKey"],
-            api_secret=conn_data["secretKey"]
-        )
+        session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
         
         # Get position info first
-        positions_result = session.get_positions(category="linear", symbol=symbol)
+        positions_result = await run_in_threadpool(session.get_positions, category="linear", symbol=symbol)
         if positions_result["retCode"] != 0:
             raise HTTPException(status_code=400, detail="Failed to get position info")
         
@@ -2428,7 +2424,8 @@ async def close_position(request: dict):
         # Create a market order to close the position
         close_side = "Sell" if side == "Buy" else "Buy"
         
-        result = session.place_order(
+        result = await run_in_threadpool(
+            session.place_order,
             category="linear",
             symbol=symbol,
             side=close_side,
@@ -2473,11 +2470,7 @@ async def modify_position(request: dict):
             raise HTTPException(status_code=404, detail="Connection not found")
         
         conn_data = connections_store[connection_id]
-        session = HTTP(
-            testnet=False,
-            api_key=conn_data["apiKey"],
-            api_secret=conn_data["secretKey"]
-        )
+        session = _get_session(conn_data["apiKey"], conn_data["secretKey"])
         
         # Build modification parameters
         modify_params = {
@@ -2496,7 +2489,7 @@ async def modify_position(request: dict):
             modify_params["slTriggerBy"] = request["slTriggerBy"]
         
         # Modify the position
-        result = session.set_trading_stop(**modify_params)
+        result = await run_in_threadpool(session.set_trading_stop, **modify_params)
         
         if result["retCode"] == 0:
             return {
@@ -2526,17 +2519,14 @@ async def create_order(request: CreateOrderRequest, current_user: dict = Depends
         connection = connections_store[request.connectionId]
         
         # Create ByBit session
-        session = HTTP(
-            testnet=False,
-            api_key=connection["apiKey"],
-            api_secret=connection["secretKey"]
-        )
+        session = _get_session(connection["apiKey"], connection["secretKey"])
         
         # Set leverage if provided
         if request.leverage and request.leverage > 1:
             try:
                 logger.info(f"🎚️ Setting leverage to {request.leverage}x for {request.symbol}")
-                leverage_result = session.set_leverage(
+                leverage_result = await run_in_threadpool(
+                    session.set_leverage,
                     category="linear",
                     symbol=request.symbol,
                     buyLeverage=str(request.leverage),
@@ -2549,7 +2539,8 @@ async def create_order(request: CreateOrderRequest, current_user: dict = Depends
         # Set position mode to hedge mode (required for new accounts)
         try:
             logger.info(f"🔧 Setting position mode to hedge mode for better compatibility")
-            position_mode_result = session.set_position_mode(
+            position_mode_result = await run_in_threadpool(
+                session.set_position_mode,
                 category="linear",
                 mode=3  # 3 = Both side mode (hedge mode)
             )
@@ -2562,7 +2553,8 @@ async def create_order(request: CreateOrderRequest, current_user: dict = Depends
             try:
                 margin_mode = "ISOLATED_MARGIN" if request.marginMode == "isolated" else "REGULAR_MARGIN"
                 logger.info(f"🔒 Setting margin mode to {margin_mode} for {request.symbol}")
-                margin_result = session.set_margin_mode(
+                margin_result = await run_in_threadpool(
+                    session.set_margin_mode,
                     category="linear",
                     symbol=request.symbol,
                     tradeMode=0 if request.marginMode == "cross" else 1,
@@ -2599,7 +2591,7 @@ async def create_order(request: CreateOrderRequest, current_user: dict = Depends
         logger.info(f"📝 Order data: {order_data}")
         
         # Place the order
-        result = session.place_order(**order_data)
+        result = await run_in_threadpool(session.place_order, **order_data)
         
         logger.info(f"📊 Order result: {result}")
         
@@ -2715,7 +2707,7 @@ async def control_strategy(request: StrategyControlRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/strategy/status/{strategy_id}")
-async def get_strategy_status(strategy_id: str):
+async def get_engine_strategy_status(strategy_id: str):
     """Get status van specific strategy"""
     try:
         status = strategy_engine.get_strategy_status(strategy_id)
@@ -2818,7 +2810,7 @@ async def get_data_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/data/market/{symbol}")
-async def get_market_data(symbol: str):
+async def get_symbol_market_data(symbol: str):
     """Get current market data voor symbol"""
     try:
         market_data = data_processor.get_market_data(symbol)
@@ -3207,6 +3199,7 @@ async def close_position_api(request: dict):
 # PERFORMANCE OPTIMIZATION ENDPOINTS
 # ================================
 
+@app.get("/api/performance/metrics")
 @app.get("/performance/metrics")
 async def get_performance_metrics(current_user: dict = Depends(require_viewer)):
     """Get current performance metrics"""
@@ -3229,6 +3222,7 @@ async def get_performance_metrics(current_user: dict = Depends(require_viewer)):
         logger.error(f"Error getting performance metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/performance/report")
 @app.get("/performance/report")
 async def get_optimization_report(current_user: dict = Depends(require_admin)):
     """Get comprehensive optimization report"""
@@ -3242,6 +3236,7 @@ async def get_optimization_report(current_user: dict = Depends(require_admin)):
         logger.error(f"Error getting optimization report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/performance/cache/clear")
 @app.post("/performance/cache/clear")
 async def clear_cache(current_user: dict = Depends(require_admin)):
     """Clear performance cache"""
@@ -3320,11 +3315,7 @@ async def startup_event():
             
             # Also create session for position sync
             try:
-                session = HTTP(
-                    testnet=False,
-                    api_key=connection_data['apiKey'],
-                    api_secret=connection_data['secretKey']
-                )
+                session = _get_session(connection_data['apiKey'], connection_data['secretKey'])
                 active_sessions[connection_id] = session
                 logger.info(f"✅ Position sync session toegevoegd: {connection_id}")
             except Exception as e:
@@ -3387,54 +3378,6 @@ async def shutdown_event():
     logger.info("✅ Services stopped cleanly")
 
 # Performance Monitoring Endpoints
-@app.get("/api/performance/metrics")
-async def get_performance_metrics(current_user: dict = Depends(require_viewer)):
-    """Get current performance metrics"""
-    try:
-        metrics = performance_optimizer.get_performance_metrics()
-        return {
-            "success": True,
-            "data": {
-                "avg_response_time": metrics.avg_response_time,
-                "requests_per_second": metrics.requests_per_second,
-                "active_connections": metrics.active_connections,
-                "memory_usage_mb": metrics.memory_usage_mb,
-                "cpu_usage_percent": metrics.cpu_usage_percent,
-                "cache_hit_rate": metrics.cache_hit_rate,
-                "error_rate": metrics.error_rate,
-                "timestamp": metrics.timestamp.isoformat()
-            }
-        }
-    except Exception as e:
-        logger.error(f"Error getting performance metrics: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/api/performance/report")
-async def get_optimization_report(current_user: dict = Depends(require_admin)):
-    """Get comprehensive optimization report"""
-    try:
-        report = performance_optimizer.get_optimization_report()
-        return {
-            "success": True,
-            "data": report
-        }
-    except Exception as e:
-        logger.error(f"Error getting optimization report: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/api/performance/cache/clear")
-async def clear_cache(current_user: dict = Depends(require_admin)):
-    """Clear performance cache"""
-    try:
-        await performance_optimizer.cache.clear()
-        return {
-            "success": True,
-            "message": "Cache cleared successfully"
-        }
-    except Exception as e:
-        logger.error(f"Error clearing cache: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
 @app.get("/api/performance/cache/stats")
 async def get_cache_stats(current_user: dict = Depends(require_viewer)):
     """Get cache statistics"""
@@ -3610,7 +3553,8 @@ async def get_klines(symbol: str, interval: str = "1h", limit: int = 100):
         session = connection["session"]
         
         # Get kline data from ByBit
-        result = session.get_kline(
+        result = await run_in_threadpool(
+            session.get_kline,
             category="linear",
             symbol=symbol,
             interval=interval,
@@ -3809,12 +3753,11 @@ async def stop_auto_trading():
 async def run_auto_trading_system(status_dict, config):
     """Background task to run the full auto trading system"""
     try:
-        from services.ai_trading_optimizer import AITradingOptimizer
-        from services.mass_symbol_manager import MassSymbolManager
+        from services.ai_trading_optimizer import ai_optimizer as optimizer
+        from services.mass_symbol_manager import mass_symbol_manager as symbol_manager
         
-        # Initialize services
-        optimizer = AITradingOptimizer()
-        symbol_manager = MassSymbolManager()
+        # Gedeelde services hergebruiken; OpenAI key opnieuw proberen als die later is toegevoegd
+        optimizer.ensure_initialized()
         
         # Get all trading symbols
         symbols = await symbol_manager.get_all_symbols()
@@ -4043,4 +3986,5 @@ if __name__ == "__main__":
     print("🎯 VOLLEDIG AUTOMATISCHE TRADING BOT ACTIEF!")
     print("⚠️  GEBRUIK OP EIGEN RISICO - LIVE TRADING")
     
+    # Eén worker: strategieën, posities en websockets leven in het proces-geheugen
     uvicorn.run(socket_app, host="0.0.0.0", port=8100, log_level="info")
\ No newline at end of file
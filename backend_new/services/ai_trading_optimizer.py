@@ -61,6 +61,12 @@ class AITradingOptimizer:
         except Exception as e:
             logger.error(f"❌ Error setting up OpenAI: {e}")
     
+    def ensure_initialized(self) -> bool:
+        """Retry the OpenAI setup if no key was available yet, e.g. when it was added after startup"""
+        if not self.is_initialized:
+            self._setup_openai()
+        return self.is_initialized
+    
     async def optimize_strategy_for_symbol(
         self,
         symbol: str,
@@ -120,8 +126,9 @@ class AITradingOptimizer:
             """
             
             # Get AI optimization suggestions
-            client = openai.OpenAI(api_key=self.openai_api_key)
-            response = client.chat.completions.create(
+            # Blocking SDK call in a thread so concurrent optimizations overlap
+            response = await asyncio.to_thread(
+                self.openai_client.chat.completions.create,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an expert cryptocurrency trading strategy optimizer. Always respond with valid JSON."},
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Async ByBit REST client
+Non-blocking alternatief voor pybit's HTTP voor gebruik in async handlers
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RECV_WINDOW = "5000"
+RATE_LIMIT_BURST = 5
+# Bucket for one-off calls (credential tests) that have no stored connection yet
+UNSAVED_BUCKET = "__unsaved__"
+# httpx sluit idle connecties standaard na 5s, dan kost elke cache-miss een nieuwe TLS handshake
+KEEPALIVE_EXPIRY = 60.0
+
+class TokenBucket:
+    """Async token bucket, callers queue in-process instead of tripping ByBit's throttle"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.ts = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def take(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.ts = time.monotonic()
+                self.tokens = 0.0
+            else:
+                self.tokens -= 1
+
+class ByBitAsyncClient:
+    """Async ByBit v5 client met gedeelde connection pool"""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Lazily create the shared AsyncClient on the running event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=settings.BYBIT_TIMEOUT,
+                limits=httpx.Limits(
+                    max_keepalive_connections=50,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+
+    def _bucket(self, connection_id: Optional[str]) -> TokenBucket:
+        """Rate limiter per connection, keyed by connection_id so secrets never become dict keys"""
+        key = connection_id or UNSAVED_BUCKET
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(settings.BYBIT_RATE_LIMIT / 60, RATE_LIMIT_BURST)
+        return bucket
+    
+    def forget(self, connection_id: str):
+        """Drop the rate limiter of a removed connection"""
+        self._buckets.pop(connection_id, None)
+
+    @staticmethod
+    def _base_url(testnet: bool) -> str:
+        return settings.BYBIT_TESTNET_URL if testnet else settings.BYBIT_MAINNET_URL
+
+    @staticmethod
+    def _sign(api_key: str, secret_key: str, timestamp: str, payload: str) -> str:
+        """HMAC-SHA256 over timestamp + api_key + recv_window + payload (same as pybit)"""
+        param_str = timestamp + api_key + RECV_WINDOW + payload
+        return hmac.new(secret_key.encode("utf-8"), param_str.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    async def _get(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        api_key: str,
+        secret_key: str,
+        testnet: bool,
+        connection_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Signed GET request, returns the raw ByBit response dict"""
+        await self._bucket(connection_id).take()
+
+        query = urlencode(params)
+        timestamp = str(int(time.time() * 1000))
+        headers = {
+            "X-BAPI-API-KEY": api_key,
+            "X-BAPI-SIGN": self._sign(api_key, secret_key, timestamp, query),
+            "X-BAPI-SIGN-TYPE": "2",
+            "X-BAPI-TIMESTAMP": timestamp,
+            "X-BAPI-RECV-WINDOW": RECV_WINDOW,
+        }
+
+        # Query string is sent exactly as signed
+        response = await self.client.get(f"{self._base_url(testnet)}{path}?{query}", headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_wallet_balance(
+        self,
+        api_key: str,
+        secret_key: str,
+        testnet: bool = False,
+        accountType: str = "UNIFIED",
+        connection_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get wallet balance"""
+        return await self._get(
+            "/v5/account/wallet-balance",
+            {"accountType": accountType},
+            api_key, secret_key, testnet, connection_id
+        )
+
+    async def get_positions(
+        self,
+        api_key: str,
+        secret_key: str,
+        testnet: bool = False,
+        category: str = "linear",
+        settleCoin: str = "USDT",
+        connection_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get open positions"""
+        return await self._get(
+            "/v5/position/list",
+            {"category": category, "settleCoin": settleCoin},
+            api_key, secret_key, testnet, connection_id
+        )
+
+    async def close(self):
+        """Close the shared connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+# Global client instance
+bybit_client = ByBitAsyncClient()
@@ -11,16 +11,50 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from dataclasses import asdict
 import os
+import time
+import threading
+import atexit
 from contextlib import contextmanager
+from itertools import chain
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Temporarily disable performance optimizer
-PERFORMANCE_OPTIMIZATION_ENABLED = False
-performance_optimizer = None
-logger.warning("Performance optimizer not available - running without optimization")
+# Trade writes worden gebundeld, één commit per batch in plaats van per trade
+TRADE_BATCH_SIZE = 128
+TRADE_FLUSH_INTERVAL = 1.0  # seconds
+TRADE_ROWS_PER_STATEMENT = 999 // 20  # 20 kolommen per trade
+MAX_PENDING_TRADES = 10000  # bovengrens voor teruggezette trades als de database onbereikbaar blijft
+TRADE_REQUIRED_FIELDS = ('id', 'connection_id', 'symbol', 'side', 'order_type', 'quantity', 'status')
+_TRADE_ROW_ERRORS = (sqlite3.IntegrityError, sqlite3.DataError, sqlite3.InterfaceError, sqlite3.ProgrammingError)
+
+# SQL als vaste strings, zodat sqlite3's statement cache ze hergebruikt
+_INSERT_TRADES_SQL = """
+    INSERT OR REPLACE INTO trades 
+    (id, strategy_id, connection_id, symbol, side, order_type, quantity, price, 
+     executed_price, executed_quantity, status, order_id, pnl, fees, leverage,
+     take_profit, stop_loss, executed_at, closed_at, metadata)
+    VALUES """
+_TRADE_PLACEHOLDERS = "(" + ", ".join(["?"] * 20) + ")"
+_INSERT_TRADES_FULL_SQL = _INSERT_TRADES_SQL + ", ".join([_TRADE_PLACEHOLDERS] * TRADE_ROWS_PER_STATEMENT)
+
+_TRADE_STATS_SQL = """
+    SELECT 
+        COUNT(*) as total_trades,
+        SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as winning_trades,
+        SUM(CASE WHEN pnl < 0 THEN 1 ELSE 0 END) as losing_trades,
+        SUM(pnl) as total_pnl,
+        AVG(CASE WHEN pnl > 0 THEN pnl END) as avg_win,
+        AVG(CASE WHEN pnl < 0 THEN pnl END) as avg_loss,
+        MAX(pnl) as max_win,
+        MIN(pnl) as max_loss
+    FROM trades 
+    WHERE created_at > datetime('now', ?)
+"""
+_TRADE_STATS_BY_STRATEGY_SQL = _TRADE_STATS_SQL + " AND strategy_id = ?"
+STATS_CACHE_TTL = 5.0  # seconds, het venster schuift maar langzaam
+MAINTENANCE_INTERVAL = 3600.0  # seconds tussen PRAGMA optimize runs
 
 class DatabaseService:
     """
@@ -29,11 +63,32 @@ class DatabaseService:
     
     def __init__(self, db_path: str = "ctb_trading_bot.db"):
         self.db_path = db_path
+        self._pending_trades: List[tuple] = []
+        self._trades_lock = threading.Lock()
+        # Eén flush tegelijk, zodat batches in volgorde gecommit worden
+        self._flush_lock = threading.Lock()
+        self._trades_queued = threading.Event()
+        self._batch_full = threading.Event()
+        self._stats_cache: Dict[tuple, tuple] = {}
+        # Eén connectie per thread, sqlite3 connecties zijn niet thread-safe te delen
+        self._local = threading.local()
         self.init_database()
+        
+        # Eén vaste writer thread, zodat getimede flushes steeds dezelfde connectie hergebruiken
+        self._writer = threading.Thread(target=self._trade_writer, name="trade-writer", daemon=True)
+        self._writer.start()
+        
+        # Eerste optimize na een uur, daarna elk uur opnieuw
+        timer = threading.Timer(MAINTENANCE_INTERVAL, self.optimize)
+        timer.daemon = True
+        timer.start()
     
     def init_database(self):
         """Initialize database tables"""
         with self.get_connection() as conn:
+            # WAL is persistent in het db bestand, één keer zetten is genoeg
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             # Strategies table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS strategies (
@@ -80,6 +135,10 @@ class DatabaseService:
                 )
             """)
             
+            # Covering indexes voor get_trading_stats, geen table scan over de hele historie
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_created_pnl ON trades (created_at, pnl)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_strategy_created ON trades (strategy_id, created_at, pnl)")
+            
             # Risk alerts table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS risk_alerts (
@@ -180,13 +239,27 @@ class DatabaseService:
     
     @contextmanager
     def get_connection(self):
-        """Get database connection with proper cleanup"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+        """Get this thread's database connection, opened once and reused"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            # Met WAL is NORMAL crash-safe, geen fsync per commit
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+            conn.execute("PRAGMA wal_autocheckpoint=1000")  # pages
+            self._local.conn = conn
+            self._local.depth = 0
+        
+        self._local.depth += 1
         try:
             yield conn
         finally:
-            conn.close()
+            self._local.depth -= 1
+            # Niet gecommit werk terugdraaien zoals close() dat eerder deed, alleen in het buitenste blok
+            if self._local.depth == 0 and conn.in_transaction:
+                conn.rollback()
     
     # Strategy CRUD operations
     def save_strategy(self, strategy: Dict[str, Any]) -> bool:
@@ -239,38 +312,23 @@ class DatabaseService:
     
     def load_all_strategies(self) -> List[Dict[str, Any]]:
         """Load all strategies"""
-        async def _load_strategies():
-            try:
-                with self.get_connection() as conn:
-                    rows = conn.execute("SELECT * FROM strategies ORDER BY created_at DESC").fetchall()
-                    strategies = []
-                    
-                    for row in rows:
-                        strategy = dict(row)
-                        strategy['config'] = json.loads(strategy['config'])
-                        strategy['risk_limits'] = json.loads(strategy['risk_limits']) if strategy['risk_limits'] else None
-                        strategy['performance'] = json.loads(strategy['performance']) if strategy['performance'] else None
-                        strategy['last_signal'] = json.loads(strategy['last_signal']) if strategy['last_signal'] else None
-                        strategies.append(strategy)
-                    
-                    return strategies
-            except Exception as e:
-                logger.error(f"❌ Error loading strategies: {e}")
-                return []
-        
-        # Use performance optimization if available
-        if PERFORMANCE_OPTIMIZATION_ENABLED:
-            try:
-                import asyncio
-                loop = asyncio.get_event_loop()
-                return loop.run_until_complete(
-                    performance_optimizer.optimized_db_operation(_load_strategies)
-                )
-            except Exception as e:
-                logger.warning(f"Performance optimization failed, falling back to direct DB access: {e}")
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute("SELECT * FROM strategies ORDER BY created_at DESC").fetchall()
+                strategies = []
+                
+                for row in rows:
+                    strategy = dict(row)
+                    strategy['config'] = json.loads(strategy['config'])
+                    strategy['risk_limits'] = json.loads(strategy['risk_limits']) if strategy['risk_limits'] else None
+                    strategy['performance'] = json.loads(strategy['performance']) if strategy['performance'] else None
+                    strategy['last_signal'] = json.loads(strategy['last_signal']) if strategy['last_signal'] else None
+                    strategies.append(strategy)
                 
-        # Fallback to direct execution
-        return asyncio.run(_load_strategies())
+                return strategies
+        except Exception as e:
+            logger.error(f"❌ Error loading strategies: {e}")
+            return []
     
     def delete_strategy(self, strategy_id: str) -> bool:
         """Delete strategy"""
@@ -286,83 +344,143 @@ class DatabaseService:
     
     # Trade CRUD operations
     def save_trade(self, trade: Dict[str, Any]) -> bool:
-        """Save trade"""
+        """Queue trade, rows are written in batches by flush_trades"""
+        # NOT NULL kolommen hier controleren, anders faalt later de hele batch
+        missing = [field for field in TRADE_REQUIRED_FIELDS if trade.get(field) is None]
+        if missing:
+            logger.error(f"❌ Error saving trade {trade.get('id')}: missing {', '.join(missing)}")
+            return False
+        
         try:
-            with self.get_connection() as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO trades 
-                    (id, strategy_id, connection_id, symbol, side, order_type, quantity, price, 
-                     executed_price, executed_quantity, status, order_id, pnl, fees, leverage,
-                     take_profit, stop_loss, executed_at, closed_at, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    trade['id'],
-                    trade.get('strategy_id'),
-                    trade['connection_id'],
-                    trade['symbol'],
-                    trade['side'],
-                    trade['order_type'],
-                    trade['quantity'],
-                    trade.get('price'),
-                    trade.get('executed_price'),
-                    trade.get('executed_quantity'),
-                    trade['status'],
-                    trade.get('order_id'),
-                    trade.get('pnl', 0),
-                    trade.get('fees', 0),
-                    trade.get('leverage', 1),
-                    trade.get('take_profit'),
-                    trade.get('stop_loss'),
-                    trade.get('executed_at'),
-                    trade.get('closed_at'),
-                    json.dumps(trade.get('metadata'))
-                ))
-                conn.commit()
-                return True
+            row = (
+                trade['id'],
+                trade.get('strategy_id'),
+                trade['connection_id'],
+                trade['symbol'],
+                trade['side'],
+                trade['order_type'],
+                trade['quantity'],
+                trade.get('price'),
+                trade.get('executed_price'),
+                trade.get('executed_quantity'),
+                trade['status'],
+                trade.get('order_id'),
+                trade.get('pnl', 0),
+                trade.get('fees', 0),
+                trade.get('leverage', 1),
+                trade.get('take_profit'),
+                trade.get('stop_loss'),
+                trade.get('executed_at'),
+                trade.get('closed_at'),
+                json.dumps(trade.get('metadata'))
+            )
         except Exception as e:
             logger.error(f"❌ Error saving trade: {e}")
             return False
+        
+        with self._trades_lock:
+            self._pending_trades.append(row)
+            pending = len(self._pending_trades)
+            if pending == 1:
+                # Eerste rij in een lege buffer, uiterlijk na het interval wegschrijven
+                self._trades_queued.set()
+        
+        if pending >= TRADE_BATCH_SIZE:
+            self._batch_full.set()
+        return True
     
-    def load_trades(self, strategy_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Load trades"""
-        async def _load_trades():
+    def _trade_writer(self):
+        """Flush queued trades after TRADE_FLUSH_INTERVAL, or as soon as a batch is full"""
+        while True:
+            self._trades_queued.wait()
+            self._batch_full.wait(TRADE_FLUSH_INTERVAL)
+            self._trades_queued.clear()
+            self._batch_full.clear()
+            self.flush_trades()
+    
+    def flush_trades(self) -> bool:
+        """Write all queued trades in one transaction, a batch that fails on the database itself is re-queued"""
+        with self._flush_lock:
+            with self._trades_lock:
+                batch, self._pending_trades = self._pending_trades, []
+            
+            if not batch:
+                return True
+            
             try:
                 with self.get_connection() as conn:
-                    if strategy_id:
-                        rows = conn.execute(
-                            "SELECT * FROM trades WHERE strategy_id = ? ORDER BY created_at DESC LIMIT ?",
-                            (strategy_id, limit)
-                        ).fetchall()
-                    else:
-                        rows = conn.execute(
-                            "SELECT * FROM trades ORDER BY created_at DESC LIMIT ?",
-                            (limit,)
-                        ).fetchall()
-                    
-                    trades = []
-                    for row in rows:
-                        trade = dict(row)
-                        trade['metadata'] = json.loads(trade['metadata']) if trade['metadata'] else None
-                        trades.append(trade)
-                    
-                    return trades
+                    try:
+                        self._insert_trades(conn, batch)
+                    except _TRADE_ROW_ERRORS as e:
+                        # Eén foute rij laat de hele multi-row INSERT falen, de rest alsnog opslaan
+                        conn.rollback()
+                        logger.warning(f"⚠️ Batch of {len(batch)} trades rejected ({e}), saving row by row")
+                        self._insert_trades_one_by_one(conn, batch)
+                    conn.commit()
+                self._stats_cache.clear()
+                return True
+            except sqlite3.OperationalError as e:
+                logger.error(f"❌ Error saving {len(batch)} trades, retrying: {e}")
+                # Vooraan terugzetten zodat de volgorde behouden blijft
+                with self._trades_lock:
+                    self._pending_trades[:0] = batch
+                    overflow = len(self._pending_trades) - MAX_PENDING_TRADES
+                    if overflow > 0:
+                        del self._pending_trades[:overflow]
+                if overflow > 0:
+                    logger.error(f"❌ Trade queue full, dropped {overflow} oldest trades")
+                self._trades_queued.set()
+                return False
             except Exception as e:
-                logger.error(f"❌ Error loading trades: {e}")
-                return []
-        
-        # Use performance optimization if available
-        if PERFORMANCE_OPTIMIZATION_ENABLED:
+                logger.error(f"❌ Error saving {len(batch)} trades: {e}")
+                return False
+    
+    def _insert_trades(self, conn, rows):
+        """Insert rows with multi-row VALUES, within SQLite's limit of 999 parameters per statement"""
+        for start in range(0, len(rows), TRADE_ROWS_PER_STATEMENT):
+            chunk = rows[start:start + TRADE_ROWS_PER_STATEMENT]
+            if len(chunk) == TRADE_ROWS_PER_STATEMENT:
+                sql = _INSERT_TRADES_FULL_SQL
+            else:
+                sql = _INSERT_TRADES_SQL + ", ".join([_TRADE_PLACEHOLDERS] * len(chunk))
+            conn.execute(sql, list(chain.from_iterable(chunk)))
+    
+    def _insert_trades_one_by_one(self, conn, rows):
+        """Insert rows separately, rows the database rejects are logged and dropped"""
+        single_sql = _INSERT_TRADES_SQL + _TRADE_PLACEHOLDERS
+        for row in rows:
             try:
-                import asyncio
-                loop = asyncio.get_event_loop()
-                return loop.run_until_complete(
-                    performance_optimizer.optimized_db_operation(_load_trades)
-                )
-            except Exception as e:
-                logger.warning(f"Performance optimization failed, falling back to direct DB access: {e}")
+                conn.execute(single_sql, row)
+            except _TRADE_ROW_ERRORS as e:
+                logger.error(f"❌ Error saving trade {row[0]}, dropped: {e}")
+    
+    def load_trades(self, strategy_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Load trades"""
+        self.flush_trades()
+        
+        try:
+            with self.get_connection() as conn:
+                if strategy_id:
+                    rows = conn.execute(
+                        "SELECT * FROM trades WHERE strategy_id = ? ORDER BY created_at DESC LIMIT ?",
+                        (strategy_id, limit)
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT * FROM trades ORDER BY created_at DESC LIMIT ?",
+                        (limit,)
+                    ).fetchall()
+                
+                trades = []
+                for row in rows:
+                    trade = dict(row)
+                    trade['metadata'] = json.loads(trade['metadata']) if trade['metadata'] else None
+                    trades.append(trade)
                 
-        # Fallback to direct execution
-        return asyncio.run(_load_trades())
+                return trades
+        except Exception as e:
+            logger.error(f"❌ Error loading trades: {e}")
+            return []
     
     # Risk alerts CRUD operations
     def save_risk_alert(self, alert: Dict[str, Any]) -> bool:
@@ -647,44 +765,61 @@ class DatabaseService:
     # Analytics and reporting
     def get_trading_stats(self, strategy_id: Optional[str] = None, days: int = 30) -> Dict[str, Any]:
         """Get trading statistics"""
+        self.flush_trades()
+        
+        # Zelfde stats binnen de TTL uit het geheugen, flush_trades maakt de cache leeg
+        key = (strategy_id, days)
+        cached = self._stats_cache.get(key)
+        if cached and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+            return dict(cached[1])
+        
         try:
             with self.get_connection() as conn:
-                query = """
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as winning_trades,
-                        SUM(CASE WHEN pnl < 0 THEN 1 ELSE 0 END) as losing_trades,
-                        SUM(pnl) as total_pnl,
-                        AVG(CASE WHEN pnl > 0 THEN pnl END) as avg_win,
-                        AVG(CASE WHEN pnl < 0 THEN pnl END) as avg_loss,
-                        MAX(pnl) as max_win,
-                        MIN(pnl) as max_loss
-                    FROM trades 
-                    WHERE created_at > datetime('now', '-{} days')
-                """.format(days)
-                
-                params = []
+                window = f"-{int(days)} days"
                 if strategy_id:
-                    query += " AND strategy_id = ?"
-                    params.append(strategy_id)
-                
-                row = conn.execute(query, params).fetchone()
+                    row = conn.execute(_TRADE_STATS_BY_STRATEGY_SQL, (window, strategy_id)).fetchone()
+                else:
+                    row = conn.execute(_TRADE_STATS_SQL, (window,)).fetchone()
                 
                 if row:
                     stats = dict(row)
                     stats['win_rate'] = (stats['winning_trades'] / stats['total_trades']) if stats['total_trades'] > 0 else 0
                     stats['profit_factor'] = abs(stats['avg_win'] * stats['winning_trades'] / (stats['avg_loss'] * stats['losing_trades'])) if stats['avg_loss'] and stats['losing_trades'] else 0
-                    return stats
+                else:
+                    stats = {
+                        'total_trades': 0, 'winning_trades': 0, 'losing_trades': 0,
+                        'total_pnl': 0, 'win_rate': 0, 'avg_win': 0, 'avg_loss': 0,
+                        'max_win': 0, 'max_loss': 0, 'profit_factor': 0
+                    }
                 
-                return {
-                    'total_trades': 0, 'winning_trades': 0, 'losing_trades': 0,
-                    'total_pnl': 0, 'win_rate': 0, 'avg_win': 0, 'avg_loss': 0,
-                    'max_win': 0, 'max_loss': 0, 'profit_factor': 0
-                }
+                self._stats_cache[key] = (time.monotonic(), stats)
+                return dict(stats)
         except Exception as e:
             logger.error(f"❌ Error getting trading stats: {e}")
             return {}
     
+    def optimize(self):
+        """Refresh query planner stats, re-armed every MAINTENANCE_INTERVAL"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA optimize")
+        except Exception as e:
+            logger.error(f"❌ Error optimizing database: {e}")
+        
+        timer = threading.Timer(MAINTENANCE_INTERVAL, self.optimize)
+        timer.daemon = True
+        timer.start()
+    
+    def close(self):
+        """Flush pending trades and truncate the WAL on shutdown"""
+        self.flush_trades()
+        try:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA optimize")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as e:
+            logger.error(f"❌ Error closing database: {e}")
+    
     def cleanup_old_data(self, days: int = 90):
         """Cleanup old data"""
         try:
@@ -709,6 +844,7 @@ class DatabaseService:
 
 # Global database instance
 database = DatabaseService()
+atexit.register(database.close)
 
 def get_database() -> DatabaseService:
     """Get database instance"""
@@ -75,13 +75,13 @@ class MassSymbolManager:
         try:
             session = list(self.connections.values())[0]
             
-            # Get instruments
-            instruments = session.get_instruments_info(category='linear')
+            # Get instruments (pybit is blocking, keep it off the event loop)
+            instruments = await asyncio.to_thread(session.get_instruments_info, category='linear')
             if instruments['retCode'] != 0:
                 raise Exception(f"Failed to fetch instruments: {instruments}")
             
             # Get 24h tickers for volume/price data
-            tickers = session.get_tickers(category='linear')
+            tickers = await asyncio.to_thread(session.get_tickers, category='linear')
             ticker_data = {ticker['symbol']: ticker for ticker in tickers['result']['list']}
             
             # Process symbols
@@ -275,6 +275,15 @@ class MassSymbolManager:
         except Exception as e:
             logger.error(f"❌ Error creating mass strategies: {e}")
     
+    async def get_all_symbols(self) -> List[str]:
+        """All tradeable USDT perpetuals in priority order, fetched on first use without creating strategies"""
+        if not self.all_symbols:
+            if not self.connections:
+                await self._load_connections()
+            await self._fetch_all_symbols()
+            await self._prioritize_symbols()
+        return self.high_priority_symbols + self.medium_priority_symbols + self.low_priority_symbols
+    
     def get_symbols_by_priority(self, priority: str) -> List[str]:
         """Get symbols by priority level"""
         if priority.upper() == 'HIGH':
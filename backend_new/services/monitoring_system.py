@@ -18,7 +18,6 @@ from email.mime.multipart import MIMEMultipart
 import os
 
 import psutil
-import pandas as pd
 from .database import get_database
 
 # Setup logging
@@ -24,6 +24,7 @@ class PyBitService:
         self.connections: Dict[str, Dict[str, Any]] = {}
         self.http_sessions: Dict[str, HTTP] = {}
         self.websocket_sessions: Dict[str, WebSocket] = {}
+        self._public_session: Optional[HTTP] = None
         self.market_data_cache: Dict[str, Any] = {}
         self.last_market_update = None
         
@@ -333,15 +334,19 @@ class PyBitService:
             logger.error(f"Failed to get connection data for {connection_id}: {e}")
             return None
     
+    def _market_session(self) -> HTTP:
+        """Session for public market endpoints, reused instead of built per call"""
+        if self.http_sessions:
+            return next(iter(self.http_sessions.values()))
+        if self._public_session is None:
+            self._public_session = HTTP(testnet=False)
+        return self._public_session
+    
     async def get_instruments(self) -> List[Dict[str, Any]]:
         """Get all available trading instruments/symbols from ByBit"""
         try:
-            # Use any available session or create temporary one
-            session = None
-            if self.http_sessions:
-                session = next(iter(self.http_sessions.values()))
-            else:
-                session = HTTP(testnet=False)
+            # Use any available session or the shared public one
+            session = self._market_session()
             
             # Get all linear instruments (USDT perpetuals)
             instruments_result = session.get_instruments_info(category="linear")
@@ -384,12 +389,7 @@ class PyBitService:
             symbols_to_fetch = symbols or self.default_symbols
             
             # Use any available session for market data (doesn't require auth)
-            session = None
-            if self.http_sessions:
-                session = next(iter(self.http_sessions.values()))
-            else:
-                # Create temporary session for market data
-                session = HTTP(testnet=False)
+            session = self._market_session()
             
             market_data = []
             
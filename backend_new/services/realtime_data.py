@@ -15,7 +15,6 @@ import threading
 from collections import deque
 import time
 
-import pandas as pd
 import numpy as np
 
 # Setup logging
@@ -76,6 +75,9 @@ class RealTimeDataProcessor:
         # Buffer size voor kline data
         self.max_buffer_size = 1000
         
+        # Laatste kline per symbol waarvoor indicators berekend zijn
+        self._indicator_klines: Dict[str, KlineData] = {}
+        
     async def start_data_feeds(self, symbols: List[str]):
         """Start real-time data feeds voor gegeven symbols"""
         if self.is_running:
@@ -266,22 +268,22 @@ class RealTimeDataProcessor:
         """Calculate real-time market metrics"""
         try:
             for symbol, market_data in self.market_data.items():
-                if symbol in self.kline_buffers and len(self.kline_buffers[symbol]) >= 20:
+                buffer = self.kline_buffers.get(symbol)
+                if buffer and len(buffer) >= 20:
+                    # Geen nieuwe kline sinds vorige run, indicators zijn ongewijzigd
+                    if buffer[-1] is self._indicator_klines.get(symbol):
+                        continue
+                    self._indicator_klines[symbol] = buffer[-1]
+                    
                     # Get recent klines
-                    klines = list(self.kline_buffers[symbol])[-20:]  # Last 20 minutes
+                    klines = list(buffer)[-20:]  # Last 20 minutes
                     
-                    # Convert to DataFrame
-                    df = pd.DataFrame([{
-                        'timestamp': k.timestamp,
-                        'open': k.open_price,
-                        'high': k.high_price,
-                        'low': k.low_price,
-                        'close': k.close_price,
-                        'volume': k.volume
-                    } for k in klines])
+                    # Direct naar arrays, geen DataFrame nodig voor de indicators
+                    close = np.fromiter((k.close_price for k in klines), dtype=np.float64, count=len(klines))
+                    volume = np.fromiter((k.volume for k in klines), dtype=np.float64, count=len(klines))
                     
                     # Calculate indicators
-                    indicators = self._calculate_indicators(df)
+                    indicators = self._calculate_indicators(close, volume)
                     
                     # Notify subscribers with indicators
                     await self._notify_subscribers('indicators', symbol, indicators)
@@ -289,47 +291,50 @@ class RealTimeDataProcessor:
         except Exception as e:
             logger.error(f"Fout bij calculating market metrics: {e}")
     
-    def _calculate_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate technical indicators"""
+    def _calculate_indicators(self, close: np.ndarray, volume: np.ndarray) -> Dict[str, Any]:
+        """Calculate technical indicators from close/volume arrays (oud -> nieuw)"""
         try:
             indicators = {}
             
-            # Moving averages
-            indicators['sma_5'] = df['close'].rolling(5).mean().iloc[-1]
-            indicators['sma_10'] = df['close'].rolling(10).mean().iloc[-1]
-            indicators['sma_20'] = df['close'].rolling(20).mean().iloc[-1]
-            
-            # RSI
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            indicators['rsi'] = (100 - (100 / (1 + rs))).iloc[-1]
-            
-            # MACD
-            ema12 = df['close'].ewm(span=12).mean()
-            ema26 = df['close'].ewm(span=26).mean()
-            indicators['macd'] = (ema12 - ema26).iloc[-1]
-            indicators['macd_signal'] = (ema12 - ema26).ewm(span=9).mean().iloc[-1]
-            
-            # Bollinger Bands
-            sma20 = df['close'].rolling(20).mean()
-            std20 = df['close'].rolling(20).std()
-            indicators['bb_upper'] = (sma20 + (std20 * 2)).iloc[-1]
-            indicators['bb_lower'] = (sma20 - (std20 * 2)).iloc[-1]
-            indicators['bb_middle'] = sma20.iloc[-1]
-            
-            # Volume metrics
-            indicators['avg_volume'] = df['volume'].rolling(10).mean().iloc[-1]
-            indicators['volume_ratio'] = df['volume'].iloc[-1] / indicators['avg_volume']
-            
-            # Price action
-            indicators['price_change_1m'] = ((df['close'].iloc[-1] - df['close'].iloc[-2]) / df['close'].iloc[-2]) * 100
-            indicators['price_change_5m'] = ((df['close'].iloc[-1] - df['close'].iloc[-6]) / df['close'].iloc[-6]) * 100 if len(df) >= 6 else 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Moving averages
+                indicators['sma_5'] = close[-5:].mean() if len(close) >= 5 else np.nan
+                indicators['sma_10'] = close[-10:].mean() if len(close) >= 10 else np.nan
+                indicators['sma_20'] = close[-20:].mean() if len(close) >= 20 else np.nan
+                
+                # RSI
+                if len(close) >= 15:
+                    delta = np.diff(close[-15:])
+                    gain = delta[delta > 0].sum() / 14
+                    loss = -delta[delta < 0].sum() / 14
+                    indicators['rsi'] = 100 - (100 / (1 + gain / loss))
+                else:
+                    indicators['rsi'] = np.nan
+                
+                # MACD, EMA12/EMA26/signal in één pass
+                indicators['macd'], indicators['macd_signal'] = self._macd(close)
+                
+                # Bollinger Bands
+                if len(close) >= 20:
+                    sma20 = indicators['sma_20']
+                    std20 = close[-20:].std(ddof=1)
+                    indicators['bb_upper'] = sma20 + (std20 * 2)
+                    indicators['bb_lower'] = sma20 - (std20 * 2)
+                    indicators['bb_middle'] = sma20
+                else:
+                    indicators['bb_upper'] = indicators['bb_lower'] = indicators['bb_middle'] = np.nan
+                
+                # Volume metrics
+                indicators['avg_volume'] = volume[-10:].mean() if len(volume) >= 10 else np.nan
+                indicators['volume_ratio'] = volume[-1] / indicators['avg_volume']
+                
+                # Price action
+                indicators['price_change_1m'] = ((close[-1] - close[-2]) / close[-2]) * 100
+                indicators['price_change_5m'] = ((close[-1] - close[-6]) / close[-6]) * 100 if len(close) >= 6 else 0
             
             # Clean NaN values
             for key, value in indicators.items():
-                if pd.isna(value):
+                if np.isnan(value):
                     indicators[key] = 0.0
                     
             return indicators
@@ -338,6 +343,27 @@ class RealTimeDataProcessor:
             logger.error(f"Fout bij calculating indicators: {e}")
             return {}
     
+    @staticmethod
+    def _macd(close: np.ndarray):
+        """MACD line en signal, zelfde waarden als pandas ewm(span, adjust=True)"""
+        a12 = 1 - 2 / (12 + 1)
+        a26 = 1 - 2 / (26 + 1)
+        a9 = 1 - 2 / (9 + 1)
+        num12 = den12 = num26 = den26 = num9 = den9 = 0.0
+        macd = signal = np.nan
+        
+        for price in close:
+            num12 = price + a12 * num12
+            den12 = 1 + a12 * den12
+            num26 = price + a26 * num26
+            den26 = 1 + a26 * den26
+            macd = num12 / den12 - num26 / den26
+            num9 = macd + a9 * num9
+            den9 = 1 + a9 * den9
+            signal = num9 / den9
+        
+        return macd, signal
+    
     async def _update_indicators(self):
         """Update technical indicators"""
         while self.is_running:
@@ -13,7 +13,6 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import math
 
-import pandas as pd
 import numpy as np
 from .database import get_database
 
@@ -487,27 +486,34 @@ class RiskManager:
     
     async def _check_position_risks(self):
         """Check individual position risks"""
+        if not self.portfolio_metrics:
+            return
+        
+        # Limits en equity één keer opzoeken, niet per positie
+        total_equity = self.portfolio_metrics.total_equity
+        max_position_risk = self.global_limits['max_single_position']
+        warn_threshold = max_position_risk * 0.8
+        high_threshold = max_position_risk * 0.95
+        
         for symbol, position in self.position_risks.items():
             # Check position size risk
-            if self.portfolio_metrics:
-                position_value = abs(position.size * position.current_price)
-                position_risk = position_value / self.portfolio_metrics.total_equity
-                max_position_risk = self.global_limits['max_single_position']
+            position_value = abs(position.size * position.current_price)
+            position_risk = position_value / total_equity
+            
+            if position_risk > warn_threshold:
+                level = RiskLevel.HIGH if position_risk > high_threshold else RiskLevel.MEDIUM
                 
-                if position_risk > max_position_risk * 0.8:
-                    level = RiskLevel.HIGH if position_risk > max_position_risk * 0.95 else RiskLevel.MEDIUM
-                    
-                    alert = RiskAlert(
-                        alert_type=RiskAlertType.POSITION_SIZE,
-                        level=level,
-                        message=f"Position {symbol} risk {position_risk:.2%} nadert limiet van {max_position_risk:.2%}",
-                        timestamp=datetime.now(timezone.utc),
-                        symbol=symbol,
-                        current_value=position_risk,
-                        limit_value=max_position_risk
-                    )
-                    
-                    await self._add_risk_alert(alert)
+                alert = RiskAlert(
+                    alert_type=RiskAlertType.POSITION_SIZE,
+                    level=level,
+                    message=f"Position {symbol} risk {position_risk:.2%} nadert limiet van {max_position_risk:.2%}",
+                    timestamp=datetime.now(timezone.utc),
+                    symbol=symbol,
+                    current_value=position_risk,
+                    limit_value=max_position_risk
+                )
+                
+                await self._add_risk_alert(alert)
     
     async def _check_correlation_risk(self):
         """Check correlation risk"""
@@ -531,11 +537,11 @@ class RiskManager:
     
     async def _check_volatility_risk(self):
         """Check volatility risk"""
-        high_vol_positions = []
-        
-        for symbol, position in self.position_risks.items():
-            if position.volatility > self.global_limits['volatility_threshold']:
-                high_vol_positions.append(symbol)
+        volatility_threshold = self.global_limits['volatility_threshold']
+        high_vol_positions = [
+            symbol for symbol, position in self.position_risks.items()
+            if position.volatility > volatility_threshold
+        ]
         
         if len(high_vol_positions) > len(self.position_risks) * 0.5:  # More than 50% high vol
             alert = RiskAlert(
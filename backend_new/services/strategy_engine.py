@@ -9,14 +9,13 @@ import json
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
 from pybit.unified_trading import HTTP
-import pandas as pd
 import numpy as np
 from .database import get_database
 
@@ -24,6 +23,26 @@ from .database import get_database
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Positions worden per connectie hooguit zo vaak via REST opgehaald
+POSITIONS_REFRESH_INTERVAL = 15.0  # seconds
+# Kline fetch wordt gedeeld binnen één execution pass (loop draait elke seconde)
+KLINE_CACHE_TTL = 1.0  # seconds
+
+_FROMISO = datetime.fromisoformat
+_UTC = timezone.utc
+
+def _parse_iso_fast(value: str) -> datetime:
+    """Parse 'YYYY-MM-DDTHH:MM:SS[.ffffff]+00:00' by slicing, else fall back to fromisoformat"""
+    n = len(value)
+    if (n == 25 or n == 32) and value[-6:] == '+00:00':
+        return datetime(
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]),
+            int(value[20:26]) if n == 32 else 0,
+            tzinfo=_UTC
+        )
+    return _FROMISO(value)
+
 class StrategyStatus(Enum):
     INACTIVE = "INACTIVE"
     ACTIVE = "ACTIVE"
@@ -124,6 +143,8 @@ class StrategyExecutionEngine:
         
         self.signal_queue = asyncio.Queue()
         self.position_monitor = {}
+        self._positions_fetched_at: Dict[str, float] = {}
+        self._kline_cache: Dict[Tuple[str, str], Tuple[float, asyncio.Future]] = {}
         
     def add_strategy(self, strategy: Strategy) -> bool:
         """Voeg nieuwe strategy toe aan execution engine"""
@@ -303,32 +324,21 @@ class StrategyExecutionEngine:
     async def _generate_signal(self, strategy: Strategy) -> Optional[TradingSignal]:
         """Genereer trading signal voor strategy"""
         try:
-            # Get market data
-            session = self.active_connections[strategy.connection_id]
-            
-            # Get kline data
-            klines = session.get_kline(
-                category="linear",
-                symbol=strategy.symbol,
-                interval="1",
-                limit=100
-            )
-            
-            if klines['retCode'] != 0:
-                logger.error(f"Kan geen kline data ophalen: {klines}")
+            # Strategies op dezelfde connectie en symbol delen één kline fetch per pass
+            key = (strategy.connection_id, strategy.symbol)
+            now = time.monotonic()
+            cached = self._kline_cache.get(key)
+            if cached is None or now - cached[0] >= KLINE_CACHE_TTL:
+                session = self.active_connections[strategy.connection_id]
+                cached = (now, asyncio.ensure_future(self._fetch_closes(session, strategy.symbol)))
+                self._kline_cache[key] = cached
+            
+            close = await cached[1]
+            if close is None:
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(klines['result']['list'])
-            df.columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover']
-            df = df.astype({
-                'open': float, 'high': float, 'low': float, 
-                'close': float, 'volume': float
-            })
-            df = df.sort_values('timestamp').reset_index(drop=True)
-            
             # Apply strategy logic
-            signal = self._apply_strategy_logic(df, strategy)
+            signal = self._apply_strategy_logic(close, strategy)
             
             return signal
             
@@ -336,8 +346,26 @@ class StrategyExecutionEngine:
             logger.error(f"Fout bij genereren signal: {e}")
             return None
     
-    def _apply_strategy_logic(self, df: pd.DataFrame, strategy: Strategy) -> Optional[TradingSignal]:
-        """Apply strategy logic to generate signals"""
+    async def _fetch_closes(self, session: HTTP, symbol: str) -> Optional[np.ndarray]:
+        """Haal 1m klines op en geef de close prices terug (oud -> nieuw)"""
+        # Get kline data, pybit is blocking so fetch off the event loop
+        klines = await asyncio.to_thread(
+            session.get_kline,
+            category="linear",
+            symbol=symbol,
+            interval="1",
+            limit=100
+        )
+        
+        if klines['retCode'] != 0:
+            logger.error(f"Kan geen kline data ophalen: {klines}")
+            return None
+        
+        # ByBit geeft nieuwste kline eerst, close staat op index 4
+        return np.array([row[4] for row in reversed(klines['result']['list'])], dtype=np.float64)
+    
+    def _apply_strategy_logic(self, close: np.ndarray, strategy: Strategy) -> Optional[TradingSignal]:
+        """Apply strategy logic to generate signals from close prices (oud -> nieuw)"""
         try:
             config = strategy.config
             
@@ -346,16 +374,13 @@ class StrategyExecutionEngine:
                 short_period = config.get('short_ma', 10)
                 long_period = config.get('long_ma', 30)
                 
-                df['ma_short'] = df['close'].rolling(short_period).mean()
-                df['ma_long'] = df['close'].rolling(long_period).mean()
-                
-                # Check crossover
-                if len(df) >= long_period:
-                    current_short = df['ma_short'].iloc[-1]
-                    current_long = df['ma_long'].iloc[-1]
-                    prev_short = df['ma_short'].iloc[-2]
-                    prev_long = df['ma_long'].iloc[-2]
-                    current_price = df['close'].iloc[-1]
+                # Check crossover, vorige bar heeft ook een volle long window nodig
+                if len(close) > long_period:
+                    current_short = close[-short_period:].mean()
+                    current_long = close[-long_period:].mean()
+                    prev_short = close[-short_period - 1:-1].mean()
+                    prev_long = close[-long_period - 1:-1].mean()
+                    current_price = close[-1]
                     
                     # Bullish crossover
                     if prev_short <= prev_long and current_short > current_long:
@@ -393,16 +418,14 @@ class StrategyExecutionEngine:
                 overbought = config.get('overbought', 70)
                 oversold = config.get('oversold', 30)
                 
-                # Calculate RSI
-                delta = df['close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-                rs = gain / loss
-                df['rsi'] = 100 - (100 / (1 + rs))
-                
-                if len(df) >= period:
-                    current_rsi = df['rsi'].iloc[-1]
-                    current_price = df['close'].iloc[-1]
+                # Calculate RSI over de laatste period deltas
+                if len(close) > period:
+                    delta = np.diff(close[-period - 1:])
+                    gain = delta[delta > 0].sum() / period
+                    loss = -delta[delta < 0].sum() / period
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        current_rsi = 100 - (100 / (1 + gain / loss))
+                    current_price = close[-1]
                     
                     # Oversold - Buy signal
                     if current_rsi < oversold:
@@ -522,7 +545,8 @@ class StrategyExecutionEngine:
             
             # Set leverage if needed
             if signal.leverage > 1:
-                leverage_result = session.set_leverage(
+                leverage_result = await asyncio.to_thread(
+                    session.set_leverage,
                     category="linear",
                     symbol=signal.symbol,
                     buyLeverage=str(signal.leverage),
@@ -553,7 +577,8 @@ class StrategyExecutionEngine:
             if signal.take_profit:
                 order_params["takeProfit"] = str(signal.take_profit)
             
-            result = session.place_order(**order_params)
+            # pybit is blocking, order round trip niet op de event loop
+            result = await asyncio.to_thread(session.place_order, **order_params)
             
             if result['retCode'] == 0:
                 order_id = result['result']['orderId']
@@ -618,13 +643,31 @@ class StrategyExecutionEngine:
     async def _monitor_positions(self):
         """Monitor open positions"""
         try:
-            for connection_id, session in self.active_connections.items():
-                positions = session.get_positions(category="linear")
+            # Alleen connecties waarvan de positions mirror verlopen is opnieuw ophalen
+            now = time.monotonic()
+            due = {
+                connection_id: session
+                for connection_id, session in self.active_connections.items()
+                if now - self._positions_fetched_at.get(connection_id, 0.0) >= POSITIONS_REFRESH_INTERVAL
+            }
+            
+            if due:
+                results = await asyncio.gather(*[
+                    asyncio.to_thread(session.get_positions, category="linear")
+                    for session in due.values()
+                ], return_exceptions=True)
                 
-                if positions['retCode'] == 0:
-                    for pos in positions['result']['list']:
-                        if float(pos['size']) > 0:  # Has position
-                            await self._check_position_conditions(pos, connection_id, session)
+                for connection_id, positions in zip(due, results):
+                    if isinstance(positions, Exception):
+                        logger.error(f"Fout bij ophalen positions voor {connection_id}: {positions}")
+                    elif positions['retCode'] == 0:
+                        self.position_monitor[connection_id] = positions['result']['list']
+                        self._positions_fetched_at[connection_id] = now
+            
+            for connection_id, session in self.active_connections.items():
+                for pos in self.position_monitor.get(connection_id, []):
+                    if float(pos['size']) > 0:  # Has position
+                        await self._check_position_conditions(pos, connection_id, session)
                             
         except Exception as e:
             logger.error(f"Fout bij monitoren positions: {e}")
@@ -739,6 +782,8 @@ class StrategyExecutionEngine:
         try:
             db = get_database()
             strategies = db.load_all_strategies()
+            now = datetime.now(timezone.utc)
+            parse_iso = _parse_iso_fast
             
             for strategy_data in strategies:
                 if strategy_data['status'] in ['ACTIVE', 'PAUSED']:
@@ -754,8 +799,8 @@ class StrategyExecutionEngine:
                             'total_pnl': 0.0, 'win_rate': 0.0, 'total_trades': 0,
                             'current_drawdown': 0.0, 'max_drawdown': 0.0
                         },
-                        created_at=datetime.fromisoformat(strategy_data['created_at']) if strategy_data['created_at'] else datetime.now(timezone.utc),
-                        last_execution=datetime.fromisoformat(strategy_data['last_execution']) if strategy_data['last_execution'] else None,
+                        created_at=parse_iso(strategy_data['created_at']) if strategy_data['created_at'] else now,
+                        last_execution=parse_iso(strategy_data['last_execution']) if strategy_data['last_execution'] else None,
                         last_signal=None  # Will be loaded separately if needed
                     )
                     self.strategies[strategy.id] = strategy
@@ -7,8 +7,10 @@ Handles real-time updates between backend services and frontend
 import asyncio
 import json
 import logging
+from collections import deque
 from datetime import datetime, timezone
 from typing import Dict, Set, Any
+import orjson
 import websockets
 from websockets.server import WebSocketServerProtocol
 
@@ -16,6 +18,19 @@ from websockets.server import WebSocketServerProtocol
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# numpy getallen blijven getallen in plaats van strings via default=str
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Per-client outbound queue size; market_data drops the oldest tick when full
+CLIENT_SEND_QUEUE_SIZE = 256
+DROP_OLDEST_SUBSCRIPTIONS = frozenset({'market_data'})
+# Message types that are always queued, even past CLIENT_SEND_QUEUE_SIZE
+NEVER_DROP_MESSAGE_TYPES = frozenset({'emergency_stop'})
+
+def _encode(data: Dict[str, Any]) -> str:
+    """Serialize a message to a JSON text frame"""
+    return orjson.dumps(data, default=str, option=_ORJSON_OPTS).decode()
+
 class WebSocketServer:
     """
     WebSocket server voor real-time communicatie met frontend
@@ -25,6 +40,9 @@ class WebSocketServer:
         self.host = host
         self.port = port
         self.clients: Set[WebSocketServerProtocol] = set()
+        # Immutable snapshot of clients, rebuilt only when the set changes
+        self._clients_snapshot: tuple = ()
+        self._clients_dirty = True
         self.subscriptions: Dict[str, Set[WebSocketServerProtocol]] = {
             'market_data': set(),
             'strategy_updates': set(),
@@ -41,6 +59,10 @@ class WebSocketServer:
             'messages_received': 0,
             'start_time': datetime.now(timezone.utc)
         }
+        
+        # Bound once so the broadcast_* helpers skip repeated attribute lookups
+        self._broadcast = self.broadcast_to_subscription
+        self._utcnow = lambda: datetime.now(timezone.utc)
     
     async def start_server(self):
         """Start WebSocket server"""
@@ -62,10 +84,17 @@ class WebSocketServer:
     async def handle_client(self, websocket: WebSocketServerProtocol, path: str):
         """Handle nieuwe client connectie"""
         self.clients.add(websocket)
+        self._clients_dirty = True
+        # (frame, message kind) pairs; _enqueue bounds it, critical frames always fit
+        send_queue: deque = deque()
+        wakeup = asyncio.Event()
         self.client_info[websocket] = {
             'connected_at': datetime.now(timezone.utc),
             'subscriptions': set(),
-            'remote_address': websocket.remote_address
+            'remote_address': websocket.remote_address,
+            'send_queue': send_queue,
+            'wakeup': wakeup,
+            'writer': asyncio.create_task(self._client_writer(websocket, send_queue, wakeup))
         }
         self.stats['connections'] += 1
         
@@ -152,20 +181,60 @@ class WebSocketServer:
     async def cleanup_client(self, websocket: WebSocketServerProtocol):
         """Cleanup when client disconnects"""
         self.clients.discard(websocket)
+        self._clients_dirty = True
         
         # Remove from all subscriptions
         for subscription_set in self.subscriptions.values():
             subscription_set.discard(websocket)
         
-        # Remove client info
-        self.client_info.pop(websocket, None)
+        # Remove client info and stop its writer (unless the writer is the one cleaning up)
+        info = self.client_info.pop(websocket, None)
+        if info is not None and info['writer'] is not asyncio.current_task():
+            info['writer'].cancel()
+    
+    async def _client_writer(self, websocket: WebSocketServerProtocol, send_queue: deque, wakeup: asyncio.Event):
+        """Drain a client's send queue so slow peers never block broadcasters"""
+        while True:
+            if not send_queue:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            frame, _ = send_queue.popleft()
+            try:
+                await websocket.send(frame)
+                self.stats['messages_sent'] += 1
+            except websockets.exceptions.ConnectionClosed:
+                await self.cleanup_client(websocket)
+                return
+            except Exception as e:
+                logger.error(f"Error sending to client {websocket.remote_address}: {e}")
+    
+    def _enqueue(self, websocket: WebSocketServerProtocol, frame: Any, subscription_type: Any,
+                 critical: bool = False) -> bool:
+        """Queue a frame for a client, applying backpressure when its queue is full"""
+        info = self.client_info.get(websocket)
+        if info is None:
+            return False
+        
+        send_queue = info['send_queue']
+        if not critical and len(send_queue) >= CLIENT_SEND_QUEUE_SIZE:
+            if subscription_type not in DROP_OLDEST_SUBSCRIPTIONS:
+                logger.warning(f"Send queue full for {info['remote_address']}, dropping {subscription_type} message")
+                return True
+            # Stale ticks are worthless, evict the oldest queued tick of the same kind
+            stale = next((item for item in send_queue if item[1] == subscription_type), None)
+            if stale is None:
+                return True
+            send_queue.remove(stale)
+        
+        send_queue.append((frame, subscription_type))
+        info['wakeup'].set()
+        return True
     
     async def send_to_client(self, websocket: WebSocketServerProtocol, data: Dict[str, Any]):
         """Send data to specific client"""
         try:
-            message = json.dumps(data, default=str)
-            await websocket.send(message)
-            self.stats['messages_sent'] += 1
+            self._enqueue(websocket, _encode(data), data.get('type'), data.get('type') in NEVER_DROP_MESSAGE_TYPES)
         except Exception as e:
             logger.error(f"Error sending to client {websocket.remote_address}: {e}")
     
@@ -178,17 +247,12 @@ class WebSocketServer:
         if not subscribers:
             return
         
-        message = json.dumps(data, default=str)
+        # Eén keer encoderen voor alle subscribers
+        message = _encode(data)
         disconnected_clients = []
         
         for client in subscribers:
-            try:
-                await client.send(message)
-                self.stats['messages_sent'] += 1
-            except websockets.exceptions.ConnectionClosed:
-                disconnected_clients.append(client)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
+            if not self._enqueue(client, message, subscription_type):
                 disconnected_clients.append(client)
         
         # Cleanup disconnected clients
@@ -200,17 +264,16 @@ class WebSocketServer:
         if not self.clients:
             return
         
-        message = json.dumps(data, default=str)
+        if self._clients_dirty:
+            self._clients_snapshot = tuple(self.clients)
+            self._clients_dirty = False
+        
+        message = _encode(data)
+        critical = data.get('type') in NEVER_DROP_MESSAGE_TYPES
         disconnected_clients = []
         
-        for client in self.clients.copy():
-            try:
-                await client.send(message)
-                self.stats['messages_sent'] += 1
-            except websockets.exceptions.ConnectionClosed:
-                disconnected_clients.append(client)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
+        for client in self._clients_snapshot:
+            if not self._enqueue(client, message, data.get('type'), critical):
                 disconnected_clients.append(client)
         
         # Cleanup disconnected clients
@@ -221,55 +284,55 @@ class WebSocketServer:
     
     async def broadcast_market_update(self, data: Dict[str, Any]):
         """Broadcast market data update"""
-        await self.broadcast_to_subscription('market_data', {
+        await self._broadcast('market_data', {
             'type': 'market_update',
             'data': data,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_price_change(self, symbol: str, price: float, change: float):
         """Broadcast price change"""
-        await self.broadcast_to_subscription('market_data', {
+        await self._broadcast('market_data', {
             'type': 'price_change',
             'symbol': symbol,
             'price': price,
             'change': change,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_strategy_signal(self, strategy_id: str, signal: Dict[str, Any]):
         """Broadcast strategy signal"""
-        await self.broadcast_to_subscription('strategy_updates', {
+        await self._broadcast('strategy_updates', {
             'type': 'strategy_signal',
             'strategy_id': strategy_id,
             'signal': signal,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_strategy_execution(self, strategy_id: str, execution: Dict[str, Any]):
         """Broadcast strategy execution"""
-        await self.broadcast_to_subscription('strategy_updates', {
+        await self._broadcast('strategy_updates', {
             'type': 'strategy_execution',
             'strategy_id': strategy_id,
             'execution': execution,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_strategy_status_change(self, strategy_id: str, status: str):
         """Broadcast strategy status change"""
-        await self.broadcast_to_subscription('strategy_updates', {
+        await self._broadcast('strategy_updates', {
             'type': 'strategy_status_change',
             'strategy_id': strategy_id,
             'status': status,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_risk_alert(self, alert: Dict[str, Any]):
         """Broadcast risk alert"""
-        await self.broadcast_to_subscription('risk_alerts', {
+        await self._broadcast('risk_alerts', {
             'type': 'risk_alert',
             'alert': alert,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_emergency_stop(self, reason: str):
@@ -277,39 +340,39 @@ class WebSocketServer:
         await self.broadcast_to_all({
             'type': 'emergency_stop',
             'reason': reason,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_portfolio_update(self, metrics: Dict[str, Any]):
         """Broadcast portfolio update"""
-        await self.broadcast_to_subscription('risk_alerts', {
+        await self._broadcast('risk_alerts', {
             'type': 'portfolio_update',
             'metrics': metrics,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_system_health_update(self, health: Dict[str, Any]):
         """Broadcast system health update"""
-        await self.broadcast_to_subscription('monitoring_alerts', {
+        await self._broadcast('monitoring_alerts', {
             'type': 'system_health_update',
             'health': health,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_alert_created(self, alert: Dict[str, Any]):
         """Broadcast new alert created"""
-        await self.broadcast_to_subscription('monitoring_alerts', {
+        await self._broadcast('monitoring_alerts', {
             'type': 'alert_created',
             'alert': alert,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     async def broadcast_alert_resolved(self, alert_id: str):
         """Broadcast alert resolved"""
-        await self.broadcast_to_subscription('monitoring_alerts', {
+        await self._broadcast('monitoring_alerts', {
             'type': 'alert_resolved',
             'alert_id': alert_id,
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': self._utcnow().isoformat()
         })
     
     def get_stats(self) -> Dict[str, Any]:
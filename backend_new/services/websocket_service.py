@@ -7,7 +7,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Set, Any, Optional
+from typing import Dict, List, Set, Any, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 
 from config.settings import settings
@@ -187,24 +187,21 @@ class WebSocketService:
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
     
-    async def _broadcast_to_specific(self, message: Dict[str, Any], websocket_ids: list):
+    async def _broadcast_to_specific(self, message: Dict[str, Any], websocket_ids: List[str]):
         """Broadcast message to specific WebSocket connections"""
         if not websocket_ids:
             return
         
         message_text = json.dumps(message)
+        active = self.active_connections
         
-        # Create tasks for specific broadcasts
-        tasks = []
-        for ws_id in websocket_ids:
-            if ws_id in self.active_connections:
-                websocket = self.active_connections[ws_id]
-                task = asyncio.create_task(self._send_safe(ws_id, websocket, message_text))
-                tasks.append(task)
-        
-        # Execute broadcasts concurrently
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        # gather wraps the coroutines itself, no explicit create_task needed
+        coros = [
+            self._send_safe(ws_id, active[ws_id], message_text)
+            for ws_id in websocket_ids if ws_id in active
+        ]
+        if coros:
+            await asyncio.gather(*coros, return_exceptions=True)
     
     async def _send_safe(self, ws_id: str, websocket: WebSocket, message: str):
         """Safely send message to WebSocket (handles disconnections)"""
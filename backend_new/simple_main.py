@@ -5,19 +5,22 @@ Minimale versie die direct werkt
 """
 
 import asyncio
-import json
 import logging
 import os
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
+import msgspec
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
 
 try:
-    from pybit.unified_trading import HTTP
+    from services.bybit_async import bybit_client
     PYBIT_AVAILABLE = True  # Enable live mode for real data
     print("🚀 Live mode enabled - real ByBit API calls")
 except ImportError:
@@ -28,13 +31,13 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Pydantic Models
-class ByBitCredentials(BaseModel):
+# Request Models (msgspec validates and decodes in one C pass)
+class ByBitCredentials(msgspec.Struct):
     apiKey: str
     secretKey: str
     testnet: bool = False
 
-class ConnectionCreate(BaseModel):
+class ConnectionCreate(msgspec.Struct):
     connectionId: str
     name: str
     apiKey: str
@@ -42,29 +45,163 @@ class ConnectionCreate(BaseModel):
     testnet: bool = False
     markets: dict = {}
 
-# Simple persistent storage
-import json
-import os
+def json_body(model):
+    """FastAPI dependency that decodes the request body straight into a msgspec Struct"""
+    decoder = msgspec.json.Decoder(model)
+    
+    async def dependency(request: Request):
+        try:
+            return decoder.decode(await request.body())
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
+    return dependency
+
+# Current UTC time as ISO string, refreshed by a 100ms ticker instead of formatted per call
+TICK_INTERVAL = 0.1
+_now_iso = datetime.utcnow().isoformat()
 
+async def _tick():
+    """Background task that keeps _now_iso current"""
+    global _now_iso
+    while True:
+        _now_iso = datetime.utcnow().isoformat()
+        await asyncio.sleep(TICK_INTERVAL)
+
+# Simple persistent storage
 STORAGE_FILE = "connections.json"
 
 def load_connections():
-    if os.path.exists(STORAGE_FILE):
-        try:
-            with open(STORAGE_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            pass
-    return {}
+    try:
+        with open(STORAGE_FILE, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        logger.error(f"Cannot read {STORAGE_FILE}, starting empty: {e}")
+        return {}
+    
+    try:
+        connections = orjson.loads(data) if data else {}
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Invalid {STORAGE_FILE}, starting empty: {e}")
+        return {}
+    
+    if not isinstance(connections, dict):
+        logger.error(f"Invalid {STORAGE_FILE}, expected an object, starting empty")
+        return {}
+    return {conn_id: conn_data for conn_id, conn_data in connections.items() if isinstance(conn_data, dict)}
+
+BACKUP_DIR = "./storage/backups"
+MAX_BACKUPS = 5
+SAVE_DELAY = 0.5  # seconds, coalesces bursts of mutations into one write
+
+CREDENTIAL_FIELDS = ("apiKey", "secretKey")
+
+def _rotate_backups():
+    """Keep the last MAX_BACKUPS versions of the storage file, with credentials stripped"""
+    try:
+        with open(STORAGE_FILE, 'rb') as f:
+            previous = orjson.loads(f.read() or b'{}')
+    except (OSError, orjson.JSONDecodeError):
+        return
+    
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    base = os.path.join(BACKUP_DIR, os.path.basename(STORAGE_FILE))
+    for n in range(MAX_BACKUPS - 1, 0, -1):
+        if os.path.exists(f"{base}.{n}"):
+            os.replace(f"{base}.{n}", f"{base}.{n + 1}")
+    
+    if isinstance(previous, dict):
+        for conn_data in previous.values():
+            if isinstance(conn_data, dict):
+                for field in CREDENTIAL_FIELDS:
+                    conn_data.pop(field, None)
+    with open(f"{base}.1", 'wb') as f:
+        f.write(orjson.dumps(previous))
+
+# ByBit credentials live in an owner-only sidecar, connections.json and its backups hold metadata only
+CREDENTIALS_FILE = "connections.credentials.json"
+
+def load_credentials() -> Dict[str, Tuple[str, str]]:
+    """Load credentials per connection_id from the sidecar file"""
+    try:
+        with open(CREDENTIALS_FILE, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return {}
+    except OSError as e:
+        logger.error(f"Cannot read {CREDENTIALS_FILE}, starting without credentials: {e}")
+        return {}
+    
+    try:
+        creds = orjson.loads(data) if data else {}
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Invalid {CREDENTIALS_FILE}, starting without credentials: {e}")
+        return {}
+    
+    if not isinstance(creds, dict):
+        logger.error(f"Invalid {CREDENTIALS_FILE}, expected an object")
+        return {}
+    return {
+        conn_id: (pair[0], pair[1])
+        for conn_id, pair in creds.items()
+        if isinstance(pair, list) and len(pair) == 2
+    }
+
+def _save_credentials(creds: Dict[str, Tuple[str, str]]):
+    """Atomically write the sidecar with 0600 permissions"""
+    tmp_file = f"{CREDENTIALS_FILE}.tmp"
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(orjson.dumps(creds))
+    os.chmod(tmp_file, 0o600)
+    os.replace(tmp_file, CREDENTIALS_FILE)
 
 def save_connections(connections):
-    with open(STORAGE_FILE, 'w') as f:
-        json.dump(connections, f, indent=2)
+    """Atomically write connections: temp file + rename, never a half-written file"""
+    # Credentials first, so a crash in between never leaves metadata without its secrets
+    _save_credentials({conn_id: _creds[conn_id] for conn_id in connections if conn_id in _creds})
+    
+    tmp_file = f"{STORAGE_FILE}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(connections))
+    _rotate_backups()
+    os.replace(tmp_file, STORAGE_FILE)
 
 connections_store = load_connections()
 
-def get_live_account_data(api_key: str, secret_key: str, testnet: bool):
-    """Get real account data from ByBit API"""
+# Credentials per connection_id, kept out of connections_store so they never reach responses
+_creds: Dict[str, Tuple[str, str]] = load_credentials()
+_save_pending = asyncio.Event()
+
+def _migrate_inline_credentials():
+    """Older connections.json files kept credentials inline, move them to the sidecar on the next save"""
+    for conn_id, conn_data in connections_store.items():
+        if any(field in conn_data for field in CREDENTIAL_FIELDS):
+            legacy = (conn_data.pop("apiKey", ""), conn_data.pop("secretKey", ""))
+            _creds.setdefault(conn_id, legacy)
+            _save_pending.set()
+
+_migrate_inline_credentials()
+
+def schedule_save_connections():
+    """Mark the store dirty, the writer task flushes it shortly after"""
+    _save_pending.set()
+
+async def _connections_writer():
+    """Background task that coalesces store mutations into delayed writes"""
+    while True:
+        await _save_pending.wait()
+        await asyncio.sleep(SAVE_DELAY)
+        _save_pending.clear()
+        try:
+            save_connections(connections_store)
+        except Exception as e:
+            logger.error(f"Failed to save connections: {e}")
+
+async def get_live_account_data(connection_id: str):
+    """Get real account data from ByBit API, raises when the credentials are rejected"""
     if not PYBIT_AVAILABLE:
         return {
             "balance": {"total": 1000, "available": 950, "inOrder": 50},
@@ -72,14 +209,17 @@ def get_live_account_data(api_key: str, secret_key: str, testnet: bool):
             "orderHistory": []
         }
     
+    api_key, secret_key = _creds[connection_id]
+    testnet = connections_store[connection_id].get("testnet", False)
+    
     try:
-        session = HTTP(testnet=testnet, api_key=api_key, api_secret=secret_key)
-        
         # Get wallet balance
-        balance_result = session.get_wallet_balance(accountType="UNIFIED")
-        balance_data = {"total": 0, "available": 0, "inOrder": 0}
+        balance_result = await bybit_client.get_wallet_balance(api_key, secret_key, testnet, accountType="UNIFIED", connection_id=connection_id)
+        if balance_result["retCode"] != 0:
+            raise Exception(f"API Error: {balance_result['retMsg']}")
         
-        if balance_result["retCode"] == 0 and balance_result["result"]["list"]:
+        balance_data = {"total": 0, "available": 0, "inOrder": 0}
+        if balance_result["result"]["list"]:
             account = balance_result["result"]["list"][0]
             balance_data = {
                 "total": float(account.get("totalEquity", "0")),
@@ -88,24 +228,30 @@ def get_live_account_data(api_key: str, secret_key: str, testnet: bool):
             }
         
         # Get positions
-        positions_result = session.get_positions(category="linear", settleCoin="USDT")
+        positions_result = await bybit_client.get_positions(
+            api_key, secret_key, testnet, category="linear", settleCoin="USDT", connection_id=connection_id
+        )
         positions = []
         if positions_result["retCode"] == 0:
-            for pos in positions_result["result"]["list"]:
-                if float(pos.get("size", "0")) > 0:
-                    positions.append({
-                        "id": f"{pos.get('symbol')}_{pos.get('side')}",
-                        "symbol": pos.get("symbol"),
-                        "direction": "LONG" if pos.get("side") == "Buy" else "SHORT",
-                        "amount": float(pos.get("size", "0")),
-                        "entryPrice": float(pos.get("avgPrice", "0")),
-                        "currentPrice": float(pos.get("markPrice", "0")),
-                        "pnl": float(pos.get("unrealisedPnl", "0")),
-                        "pnlPercent": 0,  # Calculate if needed
-                        "status": "OPEN",
-                        "exchange": "ByBit",
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
+            now = _now_iso
+            _float = float
+            positions = [
+                {
+                    "id": f"{pos.get('symbol')}_{pos.get('side')}",
+                    "symbol": pos.get("symbol"),
+                    "direction": "LONG" if pos.get("side") == "Buy" else "SHORT",
+                    "amount": size,
+                    "entryPrice": _float(pos.get("avgPrice", "0")),
+                    "currentPrice": _float(pos.get("markPrice", "0")),
+                    "pnl": _float(pos.get("unrealisedPnl", "0")),
+                    "pnlPercent": 0,  # Calculate if needed
+                    "status": "OPEN",
+                    "exchange": "ByBit",
+                    "timestamp": now
+                }
+                for pos in positions_result["result"]["list"]
+                if (size := _float(pos.get("size", "0"))) > 0
+            ]
         
         return {
             "balance": balance_data,
@@ -115,17 +261,130 @@ def get_live_account_data(api_key: str, secret_key: str, testnet: bool):
         
     except Exception as e:
         logger.error(f"Failed to get live data: {e}")
-        return {
-            "balance": {"total": 0, "available": 0, "inOrder": 0},
-            "positions": [],
-            "orderHistory": []
-        }
+        raise
+
+# Short-lived cache of live account data, keyed by connection_id
+LIVE_DATA_TTL = 3.0
+_live_data_cache: Dict[str, tuple] = {}
+_live_data_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+async def get_live_account_data_cached(connection_id: str, ttl: float = LIVE_DATA_TTL):
+    """Get live account data, reusing a recent result for the same connection"""
+    key = connection_id
+    cached = _live_data_cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    
+    # Only one in-flight fetch per account, concurrent callers reuse its result
+    async with _live_data_locks[key]:
+        cached = _live_data_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        
+        data = await get_live_account_data(connection_id)
+        _live_data_cache[key] = (time.monotonic(), data)
+        return data
+
+# Latest account data per connection, kept fresh by the background poller
+POLL_INTERVAL = 2
+latest_data: Dict[str, Dict[str, Any]] = {}
+
+EMPTY_ACCOUNT_DATA = {
+    "balance": {"total": 0, "available": 0, "inOrder": 0},
+    "positions": [],
+    "orderHistory": []
+}
+
+async def _refresh_connection(conn_id: str):
+    """Fetch one connection's account data into the snapshot"""
+    try:
+        data = await get_live_account_data_cached(conn_id, ttl=POLL_INTERVAL / 2)
+    except Exception as e:
+        # Snapshot the failure too, requests keep serving it until the next poll retries
+        if conn_id in connections_store:
+            latest_data[conn_id] = {**EMPTY_ACCOUNT_DATA, "error": str(e)}
+        raise
+    if conn_id in connections_store:
+        latest_data[conn_id] = data
+    return data
+
+# Portfolio aggregates, recomputed whenever latest_data changes so the summary endpoint is O(1)
+_portfolio_cache = {"totalPortfolioValue": 0, "totalPnL": 0, "activePositions": 0, "ts": 0}
+
+def _refresh_portfolio():
+    """Recompute portfolio aggregates from the polled snapshot"""
+    global _portfolio_cache
+    total_value = 0.0
+    total_pnl = 0.0
+    active_positions = 0
+    try:
+        for data in list(latest_data.values()):
+            total_value += data["balance"]["total"]
+            active_positions += len(data["positions"])
+            total_pnl += sum(pos["pnl"] for pos in data["positions"])
+    except Exception as e:
+        logger.error(f"Failed to refresh portfolio summary: {e}")
+        return
+    
+    # Swap in a new dict so readers never see a half-updated summary
+    _portfolio_cache = {
+        "totalPortfolioValue": total_value,
+        "totalPnL": total_pnl,
+        "activePositions": active_positions,
+        "ts": time.time()
+    }
+
+async def _poller():
+    """Poll ByBit for all connections concurrently, decoupled from client requests"""
+    while True:
+        conn_ids = list(connections_store)
+        results = await asyncio.gather(*[
+            _refresh_connection(conn_id) for conn_id in conn_ids
+        ], return_exceptions=True)
+        for conn_id, result in zip(conn_ids, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to refresh connection {conn_id}: {result}")
+        _refresh_portfolio()
+        await asyncio.sleep(POLL_INTERVAL)
+
+_background_tasks: set = set()
+# add_connection waits this long for ByBit to accept the credentials before answering 202
+ADD_CONNECTION_VALIDATE_TIMEOUT = 2.0
+
+async def _warmup(conn_id: str):
+    """Fetch a new connection's data, then mark it active or flag it when ByBit rejects it"""
+    try:
+        data = await _refresh_connection(conn_id)
+    except Exception as e:
+        logger.warning(f"Warmup failed for connection {conn_id}: {e}")
+        result, status = e, "error"
+    else:
+        result, status = data, "active"
+    
+    if conn_id in connections_store:
+        connections_store[conn_id]["status"] = status
+        schedule_save_connections()
+        # Nieuwe connectie meteen meetellen, niet pas na de volgende poll
+        _refresh_portfolio()
+    return result
+
+def _forget_connection(conn_id: str):
+    """Drop a connection with its credentials, cached data, lock and rate limiter"""
+    connections_store.pop(conn_id, None)
+    _creds.pop(conn_id, None)
+    latest_data.pop(conn_id, None)
+    _live_data_cache.pop(conn_id, None)
+    _live_data_locks.pop(conn_id, None)
+    if PYBIT_AVAILABLE:
+        bybit_client.forget(conn_id)
+    _refresh_portfolio()
 
 # FastAPI app
 app = FastAPI(
     title="CTB Trading Bot - Simple PyBit Backend",
     description="Eenvoudige PyBit API integratie",
-    version="2.0.0-simple"
+    version="2.0.0-simple",
+    default_response_class=ORJSONResponse
 )
 
 # CORS
@@ -137,30 +396,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup_event():
+    """Start background tasks"""
+    app.state.ticker = asyncio.create_task(_tick())
+    app.state.connections_writer = asyncio.create_task(_connections_writer())
+    app.state.poller = asyncio.create_task(_poller())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending writes and close the shared ByBit connection pool"""
+    app.state.ticker.cancel()
+    app.state.connections_writer.cancel()
+    app.state.poller.cancel()
+    if _save_pending.is_set():
+        save_connections(connections_store)
+    
+    if PYBIT_AVAILABLE:
+        await bybit_client.close()
+
+# Static response bodies, only the health timestamp and connection count are spliced in
+_ROOT_BODY = orjson.dumps({
+    "message": "CTB Trading Bot - Simple PyBit Backend",
+    "version": "2.0.0-simple",
+    "status": "running",
+    "pybit_available": PYBIT_AVAILABLE
+})
+_HEALTH_PREFIX = orjson.dumps({
+    "success": True,
+    "message": "CTB Backend is running",
+    "status": "healthy",
+    "version": "2.0.0-simple",
+    "pybit_available": PYBIT_AVAILABLE
+})[:-1] + b',"timestamp":"'
+
 @app.get("/")
 async def root():
-    return {
-        "message": "CTB Trading Bot - Simple PyBit Backend",
-        "version": "2.0.0-simple",
-        "status": "running",
-        "pybit_available": PYBIT_AVAILABLE
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 @app.get("/api/health")
 async def health_check():
-    return {
-        "success": True,
-        "message": "CTB Backend is running",
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "2.0.0-simple",
-        "active_connections": len(connections_store),
-        "pybit_available": PYBIT_AVAILABLE
-    }
+    body = _HEALTH_PREFIX + _now_iso.encode() + b'","active_connections":' + str(len(connections_store)).encode() + b'}'
+    return Response(content=body, media_type="application/json")
 
 @app.post("/api/bybit/test-connection")
-async def test_bybit_connection(credentials: ByBitCredentials):
+async def test_bybit_connection(credentials: ByBitCredentials = Depends(json_body(ByBitCredentials))):
     """Test ByBit API connection"""
     if not PYBIT_AVAILABLE:
         return {
@@ -170,14 +451,13 @@ async def test_bybit_connection(credentials: ByBitCredentials):
         }
     
     try:
-        session = HTTP(
-            testnet=credentials.testnet,
-            api_key=credentials.apiKey,
-            api_secret=credentials.secretKey,
+        result = await bybit_client.get_wallet_balance(
+            credentials.apiKey,
+            credentials.secretKey,
+            credentials.testnet,
+            accountType="UNIFIED"
         )
         
-        result = session.get_wallet_balance(accountType="UNIFIED")
-        
         if result["retCode"] == 0:
             return {
                 "success": True,
@@ -191,63 +471,82 @@ async def test_bybit_connection(credentials: ByBitCredentials):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/bybit/add-connection")
-async def add_connection(connection: ConnectionCreate):
+async def add_connection(connection: ConnectionCreate = Depends(json_body(ConnectionCreate))):
     """Add new ByBit connection"""
+    conn_id = connection.connectionId
     try:
-        # In demo mode, skip actual API test
-        if PYBIT_AVAILABLE:
-            # Test connection first
-            session = HTTP(
-                testnet=connection.testnet,
-                api_key=connection.apiKey,
-                api_secret=connection.secretKey,
-            )
-            result = session.get_wallet_balance(accountType="UNIFIED")
-            if result["retCode"] != 0:
-                raise Exception(f"API Error: {result['retMsg']}")
-        
-        # Store connection
-        connections_store[connection.connectionId] = {
+        # Store connection, pending until the first fetch validates the credentials
+        _forget_connection(conn_id)
+        _creds[conn_id] = (connection.apiKey, connection.secretKey)
+        connections_store[conn_id] = {
             "name": connection.name,
             "testnet": connection.testnet,
             "markets": connection.markets,
-            "apiKey": connection.apiKey,
-            "secretKey": connection.secretKey,
-            "created_at": datetime.utcnow().isoformat(),
-            "status": "active"
+            "created_at": _now_iso,
+            "status": "pending"
         }
-        save_connections(connections_store)
+        schedule_save_connections()
         
-        return {
-            "success": True,
-            "message": "Connection added successfully",
-            "connectionId": connection.connectionId,
-            "data": get_live_account_data(connection.apiKey, connection.secretKey, connection.testnet)
-        }
+        task = asyncio.create_task(_warmup(conn_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    
+    # Wait briefly for validation; a slow ByBit answer finishes in the background instead
+    try:
+        result = await asyncio.wait_for(asyncio.shield(task), ADD_CONNECTION_VALIDATE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return ORJSONResponse(status_code=202, content={
+            "success": True,
+            "message": "Connection added, validation pending",
+            "connectionId": conn_id,
+            "status": "pending",
+            "data": EMPTY_ACCOUNT_DATA
+        })
+    
+    if isinstance(result, Exception):
+        _forget_connection(conn_id)
+        schedule_save_connections()
+        raise HTTPException(status_code=400, detail=str(result))
+    
+    return {
+        "success": True,
+        "message": "Connection added successfully",
+        "connectionId": conn_id,
+        "status": "active",
+        "data": result
+    }
 
 @app.get("/api/bybit/connections")
 async def get_connections():
     """Get all connections"""
-    connections = []
+    items = list(connections_store.items())
     
-    for conn_id, conn_data in connections_store.items():
+    # Serve the poller's snapshot, only connections it has not reached yet are fetched now
+    missing = [conn_id for conn_id, _ in items if conn_id not in latest_data]
+    if missing:
+        await asyncio.gather(*[
+            _refresh_connection(conn_id) for conn_id in missing
+        ], return_exceptions=True)
+    
+    connections = []
+    for conn_id, conn_data in items:
+        data = latest_data.get(conn_id)
+        if data is None:
+            data = EMPTY_ACCOUNT_DATA
         connections.append({
             "connection_id": conn_id,
             "name": conn_data["name"],
             "testnet": conn_data["testnet"],
             "status": conn_data["status"],
             "created_at": conn_data["created_at"],
-            "data": get_live_account_data(
-                conn_data.get("apiKey", ""), 
-                conn_data.get("secretKey", ""), 
-                conn_data.get("testnet", False)
-            )
+            "data": data
         })
     
-    return {"success": True, "connections": connections}
+    # Payload is plain JSON types already, skip FastAPI's jsonable_encoder pass
+    return ORJSONResponse({"success": True, "connections": connections})
 
 @app.get("/api/bybit/connection/{connection_id}")
 async def get_connection(connection_id: str):
@@ -264,7 +563,7 @@ async def get_connection(connection_id: str):
             "balance": {"total": 1000, "available": 950, "inOrder": 50},
             "positions": [],
             "orderHistory": [],
-            "lastUpdated": datetime.utcnow().isoformat(),
+            "lastUpdated": _now_iso,
             "metadata": conn_data
         }
     }
@@ -275,7 +574,8 @@ async def remove_connection(connection_id: str):
     if connection_id not in connections_store:
         raise HTTPException(status_code=404, detail="Connection not found")
     
-    del connections_store[connection_id]
+    _forget_connection(connection_id)
+    schedule_save_connections()
     
     return {"success": True, "message": "Connection removed"}
 
@@ -294,12 +594,13 @@ async def get_market_data():
 @app.get("/api/portfolio/summary")
 async def get_portfolio_summary():
     """Get portfolio summary"""
+    summary = _portfolio_cache
     return {
         "success": True,
         "summary": {
-            "totalPortfolioValue": len(connections_store) * 1000,
-            "totalPnL": 50,
-            "activePositions": 0,
+            "totalPortfolioValue": summary["totalPortfolioValue"],
+            "totalPnL": summary["totalPnL"],
+            "activePositions": summary["activePositions"],
             "totalConnections": len(connections_store)
         }
     }
@@ -310,4 +611,11 @@ if __name__ == "__main__":
     print("📚 Docs: http://localhost:8000/docs")
     print("🔄 PyBit Available:", PYBIT_AVAILABLE)
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
\ No newline at end of file
+    # connections_store lives in process memory, so extra workers are opt-in
+    uvicorn.run(
+        "simple_main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ.get("CTB_WORKERS", 1)),
+        log_level="info"
+    )
\ No newline at end of file
@@ -6,9 +6,13 @@ Start de PyBit backend server
 
 import os
 import sys
+import hashlib
 import subprocess
 import logging
 
+BOOT_MARKER = "./storage/.boot_ok"
+REQUIREMENTS_FILE = "requirements.txt"
+
 def check_requirements():
     """Check if requirements are installed"""
     try:
@@ -22,6 +26,28 @@ def check_requirements():
         print("Please run: pip install -r requirements.txt")
         return False
 
+def requirements_hash():
+    """SHA256 of requirements.txt, empty if the file is missing"""
+    try:
+        with open(REQUIREMENTS_FILE, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+def requirements_verified(current_hash):
+    """True if the last successful boot used the same requirements.txt"""
+    try:
+        with open(BOOT_MARKER, "r") as f:
+            return bool(current_hash) and f.read().strip() == current_hash
+    except FileNotFoundError:
+        return False
+
+def mark_requirements_verified(current_hash):
+    """Remember that the requirements for this hash import fine"""
+    os.makedirs(os.path.dirname(BOOT_MARKER), exist_ok=True)
+    with open(BOOT_MARKER, "w") as f:
+        f.write(current_hash)
+
 def create_storage_directory():
     """Create storage directory if it doesn't exist"""
     storage_path = "./storage"
@@ -34,8 +60,13 @@ def main():
     print("🚀 Starting CTB Trading Bot - PyBit Backend")
     print("=" * 50)
     
-    # Check requirements
-    if not check_requirements():
+    # Check requirements, skipped when requirements.txt is unchanged since the last good boot
+    current_hash = requirements_hash()
+    if requirements_verified(current_hash):
+        print("✅ Requirements unchanged since last boot, skipping import check")
+    elif check_requirements():
+        mark_requirements_verified(current_hash)
+    else:
         sys.exit(1)
     
     # Create storage directory
@@ -59,13 +90,19 @@ def main():
     try:
         # Import and run
         import uvicorn
-        from main import app
+        
+        # Reload watches the filesystem and forces a single worker, dev only
+        reload = os.environ.get("CTB_DEV") == "1"
+        # Services keep state in process memory, so extra workers must be asked for explicitly
+        workers = 1 if reload else int(os.environ.get("CTB_WORKERS", 1))
         
         uvicorn.run(
-            app,
+            "main:app",
             host="0.0.0.0",
             port=8000,
-            reload=True,
+            reload=reload,
+            reload_dirs=[os.path.dirname(os.path.abspath(__file__))] if reload else None,
+            workers=workers,
             log_level="info"
         )
     except KeyboardInterrupt: